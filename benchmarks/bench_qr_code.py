@@ -0,0 +1,52 @@
+import pytest
+from rest_framework.test import APIRequestFactory
+
+PAYLOAD_SIZES = [16, 256, 1024]
+ERROR_CORRECTION_LEVELS = ["L", "M", "Q", "H"]
+ACCEPT = {"json": "application/json", "png": "image/png", "svg": "image/svg+xml"}
+
+
+def payload(size):
+    return ("https://tickets.example.com/t/" + "0123456789abcdef" * 64)[:size]
+
+
+@pytest.fixture
+def post_qrcode():
+    """
+    Posts to QRCodeView, emptying its cache first unless `cached`.
+    """
+    from modules.qr_code.qr_code import caching
+    from modules.qr_code.qr_code.viewsets import QRCodeView
+
+    view = QRCodeView.as_view()
+    factory = APIRequestFactory()
+
+    def post(data, output="json", cached=False):
+        if not cached:
+            caching.renders.clear()
+        request = factory.post("/qrcode/", data, format="json", HTTP_ACCEPT=ACCEPT[output])
+        response = view(request).render()
+        assert response.status_code == 200, response.content
+        return response
+
+    return post
+
+
+@pytest.mark.benchmark(group="qrcode-render")
+@pytest.mark.parametrize("level", ERROR_CORRECTION_LEVELS)
+@pytest.mark.parametrize("size", PAYLOAD_SIZES)
+def bench_qrcode(measure, post_qrcode, size, level):
+    measure(post_qrcode, {"text": payload(size), "error_correction": level}, payload_bytes=size)
+
+
+@pytest.mark.benchmark(group="qrcode-output")
+@pytest.mark.parametrize("output", list(ACCEPT))
+def bench_qrcode_output(measure, post_qrcode, output):
+    measure(post_qrcode, {"text": payload(256)}, output)
+
+
+@pytest.mark.benchmark(group="qrcode-output")
+def bench_qrcode_cached(measure, post_qrcode):
+    data = {"text": payload(256)}
+    post_qrcode(data)
+    measure(post_qrcode, data, "json", True)
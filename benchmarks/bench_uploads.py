@@ -0,0 +1,73 @@
+import base64
+import os
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+
+KB = 1024
+MB = 1024 * KB
+
+SIZES = {"100KB": 100 * KB, "1MB": MB, "10MB": 10 * MB, "50MB": 50 * MB}
+# Camera uploads are limited to 20MB by default.
+IMAGE_UPLOAD_SIZES = {"100KB": 100 * KB, "1MB": MB, "10MB": 10 * MB}
+
+
+def data_uri(header, content):
+    return "data:{0};base64,{1}".format(header, base64.b64encode(content).decode("ascii"))
+
+
+@pytest.mark.benchmark(group="base64-file-field")
+@pytest.mark.parametrize("size", list(SIZES))
+def bench_base64_file_field(measure, size):
+    from modules.django_files.files.serializers import Base64FileField
+
+    content = os.urandom(SIZES[size])
+    measure(Base64FileField().run_validation, data_uri("report.bin", content), payload_bytes=len(content))
+
+
+@pytest.mark.benchmark(group="base64-image-field")
+@pytest.mark.parametrize("size", list(SIZES))
+def bench_base64_image_field(measure, image_bytes, size):
+    from modules.django_articles.articles.serializers import Base64ImageField
+
+    content = image_bytes(SIZES[size], "PNG")
+    measure(Base64ImageField().run_validation, data_uri("image/png", content), payload_bytes=len(content))
+
+
+def validate_upload(serializer_class, name, content):
+    serializer = serializer_class(data={"image": SimpleUploadedFile(name, content)})
+    assert serializer.is_valid(), serializer.errors
+
+
+@pytest.mark.benchmark(group="camera-upload")
+@pytest.mark.parametrize("format", ["JPEG", "PNG"])
+@pytest.mark.parametrize("size", list(IMAGE_UPLOAD_SIZES))
+def bench_camera_upload(measure, image_bytes, size, format):
+    from modules.camera.camera.serializers import ImageUploadSerializer
+
+    content = image_bytes(IMAGE_UPLOAD_SIZES[size], format)
+    measure(validate_upload, ImageUploadSerializer, "photo." + format.lower(), content, payload_bytes=len(content))
+
+
+@pytest.mark.benchmark(group="signature-upload")
+@pytest.mark.parametrize("size", list(IMAGE_UPLOAD_SIZES))
+def bench_signature_upload(measure, image_bytes, size):
+    from modules.django_signature.signature.serializers import SignatureUploadSerializer
+
+    content = image_bytes(IMAGE_UPLOAD_SIZES[size], "PNG")
+    measure(validate_upload, SignatureUploadSerializer, "signature.png", content, payload_bytes=len(content))
+
+
+@pytest.mark.benchmark(group="signature-upload")
+@pytest.mark.parametrize("strokes", [10, 100])
+def bench_signature_strokes(measure, strokes):
+    from modules.django_signature.signature.serializers import SignatureStrokesSerializer
+
+    points = [coordinate for i in range(200) for coordinate in (i * 1.5 % 350, i * 0.7 % 150)]
+    data = {"width": 350, "height": 150, "strokes": [points] * strokes}
+
+    def validate():
+        serializer = SignatureStrokesSerializer(data=data)
+        assert serializer.is_valid(), serializer.errors
+
+    measure(validate)
@@ -0,0 +1,140 @@
+"""
+Benchmarks run against a backend laid out like the ones modules are
+installed in (see docs/authoring.md): the Python packages of the Django
+modules under `modules/`, next to the `modules.utils.get_options()` they
+read their options with.
+"""
+import functools
+import io
+import os
+import shutil
+import sys
+import tempfile
+import tracemalloc
+
+import pytest
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Directory of each Python package in /backend/modules, and where it lives in
+# this repository.
+PACKAGES = {
+    "django_articles": "modules/django-articles/django_articles",
+    "django_files": "modules/django-files/django_files",
+    "camera": "modules/camera/backend/modules/camera",
+    "django_signature": "modules/django-signature/django_signature",
+    "qr_code": "modules/django-qr-code/qr_code",
+}
+
+# Options modules, by the slug modules request them with.
+UTILS = '''import importlib
+
+OPTIONS = {
+    "django_articles": "modules.django_articles.articles.options",
+    "files": "modules.django_files.files.options",
+    "camera": "modules.camera.camera.options",
+    "django_signature": "modules.django_signature.signature.options",
+    "qr_code": "modules.qr_code.qr_code.options",
+}
+
+
+def get_options(slug, key):
+    return getattr(importlib.import_module(OPTIONS[slug]), key)
+'''
+
+backend_dir = None
+
+
+def build_backend(directory):
+    modules_dir = os.path.join(directory, "modules")
+    os.mkdir(modules_dir)
+    open(os.path.join(modules_dir, "__init__.py"), "w").close()
+    with open(os.path.join(modules_dir, "utils.py"), "w") as utils:
+        utils.write(UTILS)
+    for name, path in PACKAGES.items():
+        os.symlink(os.path.join(REPO_DIR, path), os.path.join(modules_dir, name))
+
+
+def pytest_configure(config):
+    global backend_dir
+    import django
+    from django.conf import settings
+
+    backend_dir = tempfile.mkdtemp(prefix="modules-benchmarks-")
+    build_backend(backend_dir)
+    sys.path.insert(0, backend_dir)
+    settings.configure(
+        SECRET_KEY="benchmarks",
+        INSTALLED_APPS=[
+            "django.contrib.auth",
+            "django.contrib.contenttypes",
+            "rest_framework",
+            "modules.django_articles.articles",
+            "modules.django_files.files",
+            "modules.camera.camera",
+            "modules.django_signature.signature",
+            "modules.qr_code.qr_code",
+        ],
+        DATABASES={"default": {"ENGINE": "django.db.backends.sqlite3", "NAME": ":memory:"}},
+        CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}},
+        MEDIA_ROOT=os.path.join(backend_dir, "media"),
+        MEDIA_URL="/media/",
+        USE_TZ=True,
+        DEFAULT_AUTO_FIELD="django.db.models.AutoField",
+    )
+    django.setup()
+
+
+def pytest_unconfigure(config):
+    if backend_dir is not None:
+        shutil.rmtree(backend_dir, ignore_errors=True)
+
+
+@pytest.fixture
+def measure(benchmark):
+    """
+    Benchmarks `function(*args)`, after one traced call recording its peak
+    memory. Given `payload_bytes`, the throughput in bytes per second is
+    recorded as well. Both end up in the `extra_info` of the JSON results.
+    """
+
+    def run(function, *args, payload_bytes=None):
+        tracemalloc.start()
+        try:
+            function(*args)
+            benchmark.extra_info["peak_memory_bytes"] = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        result = benchmark(function, *args)
+        if payload_bytes is not None:
+            benchmark.extra_info["payload_bytes"] = payload_bytes
+            if benchmark.stats:
+                benchmark.extra_info["throughput_bytes_per_second"] = (
+                    payload_bytes / benchmark.stats.stats.mean
+                )
+        return result
+
+    return run
+
+
+@functools.lru_cache(maxsize=None)
+def noise_image(size, format):
+    """
+    Returns an image of random noise, which doesn't compress, encoded in
+    `format` to about `size` bytes.
+    """
+    import numpy
+    from PIL import Image
+
+    # Encoded bytes per pixel of noise, measured.
+    bytes_per_pixel = {"PNG": 3.0, "JPEG": 0.9}[format]
+    side = max(8, int((size / bytes_per_pixel) ** 0.5))
+    pixels = numpy.random.default_rng(0).integers(0, 256, (side, side, 3), dtype=numpy.uint8)
+    buffered = io.BytesIO()
+    Image.fromarray(pixels).save(buffered, format, quality=90)
+    return buffered.getvalue()
+
+
+@pytest.fixture
+def image_bytes():
+    return noise_image
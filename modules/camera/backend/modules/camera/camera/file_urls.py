@@ -0,0 +1,94 @@
+import hashlib
+
+from django.core.cache import cache
+from django.core.files.storage import FileSystemStorage
+from django.db import models
+from rest_framework import serializers
+
+from modules.utils import get_options
+
+URL_CACHE_MARGIN = get_options("camera", "URL_CACHE_MARGIN")
+URL_CACHE_TIMEOUT = get_options("camera", "URL_CACHE_TIMEOUT")
+
+
+def url_cache_timeout(storage):
+    """
+    :return: How long the URLs of `storage` can be cached, None when they are
+        cheaper to build than to fetch from the cache.
+    """
+    if isinstance(storage, FileSystemStorage):
+        return None
+    if getattr(storage, "querystring_auth", False):
+        # Signed URLs are kept until shortly before they expire.
+        timeout = getattr(storage, "querystring_expire", 3600) - URL_CACHE_MARGIN
+        return timeout if timeout > 0 else None
+    return URL_CACHE_TIMEOUT
+
+
+def cache_key(storage, name):
+    location = "{0}:{1}".format(getattr(storage, "bucket_name", ""), name)
+    return "camera:url:" + hashlib.md5(location.encode()).hexdigest()
+
+
+def resolve_urls(files):
+    """
+    Returns the URLs of a page of files, fetching those already built from the
+    cache in a single round-trip, and building and caching the rest.
+    :return: A dict of URLs by file name.
+    """
+    urls = {}
+    by_storage = {}
+    for field_file in files:
+        if field_file:
+            by_storage.setdefault(field_file.storage, set()).add(field_file.name)
+
+    for storage, names in by_storage.items():
+        timeout = url_cache_timeout(storage)
+        if timeout is None:
+            urls.update((name, storage.url(name)) for name in names)
+            continue
+        keys = {cache_key(storage, name): name for name in names}
+        cached = cache.get_many(list(keys))
+        missing = {}
+        for key, name in keys.items():
+            if key in cached:
+                urls[name] = cached[key]
+            else:
+                urls[name] = missing[key] = storage.url(name)
+        if missing:
+            cache.set_many(missing, timeout)
+    return urls
+
+
+class URLResolvingListSerializer(serializers.ListSerializer):
+    """
+    Resolves the URLs of the files of all the listed objects at once, before
+    serializing them one by one.
+    """
+
+    def to_representation(self, data):
+        items = list(data.all() if isinstance(data, models.Manager) else data)
+        self.child.resolved_urls = resolve_urls(
+            getattr(item, field_name)
+            for item in items
+            for field_name in self.child.url_fields
+        )
+        return super().to_representation(items)
+
+
+class URLResolvingMixin:
+    """
+    For serializers exposing the URLs of the `url_fields` file fields through
+    `file_url()`, with `URLResolvingListSerializer` as `list_serializer_class`.
+    Lists resolve them in batch, single objects through the same cache.
+    """
+
+    url_fields = ()
+    resolved_urls = None
+
+    def file_url(self, field_file):
+        if not field_file:
+            return None
+        if self.resolved_urls is None or field_file.name not in self.resolved_urls:
+            return resolve_urls([field_file])[field_file.name]
+        return self.resolved_urls[field_file.name]
@@ -0,0 +1,38 @@
+"""
+Perceptual hashing of images, to find near-duplicates. Kept free of Django
+imports, like `transforms`, so worker processes can use it.
+"""
+import numpy
+from PIL import Image, ImageOps
+
+# A 64 bits hash is stored as 4 indexed 16 bits segments. Two hashes at most
+# SEGMENTS - 1 bits apart have at least one segment in common, so candidates
+# are found with exact index lookups.
+SEGMENTS = 4
+SEGMENT_BITS = 16
+MAX_DISTANCE = SEGMENTS - 1
+
+
+def dhash(image):
+    """
+    Difference hash: the image is reduced to 9x8 gray pixels, and each bit
+    tells whether a pixel is brighter than its right neighbour. Resizing,
+    recompression and small edits barely change it.
+    :return: The hash, as a 16 characters hex string.
+    """
+    image.draft("L", (64, 64))
+    image = ImageOps.exif_transpose(image).convert("L")
+    pixels = numpy.asarray(image.resize((9, 8), Image.BOX), dtype=numpy.int16)
+    bits = (pixels[:, 1:] > pixels[:, :-1]).flatten()
+    value = int("".join("1" if bit else "0" for bit in bits), 2)
+    return "{0:016x}".format(value)
+
+
+def segments(hex_hash):
+    value = int(hex_hash, 16)
+    mask = (1 << SEGMENT_BITS) - 1
+    return [(value >> (SEGMENT_BITS * i)) & mask for i in range(SEGMENTS)]
+
+
+def distance(hex_hash, other):
+    return bin(int(hex_hash, 16) ^ int(other, 16)).count("1")
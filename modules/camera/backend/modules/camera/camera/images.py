@@ -0,0 +1,72 @@
+import warnings
+
+from PIL import Image as PILImage
+
+from modules.utils import get_options
+
+MAX_UPLOAD_BYTES = get_options("camera", "MAX_UPLOAD_BYTES")
+MAX_IMAGE_PIXELS = get_options("camera", "MAX_IMAGE_PIXELS")
+ALLOWED_FORMATS = get_options("camera", "ALLOWED_FORMATS")
+
+# JPEG is decoded at 1/8 scale to validate it, see `validate_image`.
+DRAFT_SIZE = (1, 1)
+
+
+class InvalidImage(Exception):
+    pass
+
+
+def open_image(file):
+    """
+    Opens an image reading its header only, and checks its format and pixel
+    count before anything gets decoded.
+    :return: The Pillow image, not loaded.
+    :raises InvalidImage:
+    """
+    file.seek(0)
+    try:
+        with warnings.catch_warnings():
+            # Our own limit applies, Pillow's bomb check would only warn first.
+            warnings.simplefilter("ignore", PILImage.DecompressionBombWarning)
+            image = PILImage.open(file)
+    except PILImage.DecompressionBombError:
+        raise InvalidImage("Image is too large.")
+    except Exception:
+        raise InvalidImage("Upload a valid image.")
+    if image.format not in ALLOWED_FORMATS:
+        raise InvalidImage("Unsupported image format {0}.".format(image.format))
+    width, height = image.size
+    if width * height > MAX_IMAGE_PIXELS:
+        raise InvalidImage(
+            "Image is too large: {0}x{1} exceeds {2} pixels.".format(
+                width, height, MAX_IMAGE_PIXELS
+            )
+        )
+    return image
+
+
+def validate_image(file):
+    """
+    Checks an uploaded image is within limits and not corrupt, without a full
+    decode. JPEG is decoded in draft mode, where libjpeg scales down by 8 in
+    the DCT, which reads every byte for a fraction of the time and memory.
+    Other formats are checked by `verify()`, which doesn't decode pixels.
+    :return: The image format.
+    :raises InvalidImage:
+    """
+    if file.size > MAX_UPLOAD_BYTES:
+        raise InvalidImage(
+            "Image exceeds the maximum size of {0} bytes.".format(MAX_UPLOAD_BYTES)
+        )
+    image = open_image(file)
+    try:
+        if image.format in ("JPEG", "MPO"):
+            image.draft("RGB", DRAFT_SIZE)
+            image.load()
+        else:
+            image.verify()
+    except Exception:
+        raise InvalidImage("Upload a valid image, this one is corrupt.")
+    finally:
+        file.seek(0)
+    return image.format
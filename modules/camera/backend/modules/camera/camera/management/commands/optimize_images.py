@@ -0,0 +1,70 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+from django.utils import timezone
+
+from ...models import Image
+from ...processing import get_executors, optimize_image
+
+
+class Command(BaseCommand):
+    help = (
+        "Optimizes images still pending, i.e. uploaded before optimization "
+        "existed or while the server restarted."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--retry-failed",
+            action="store_true",
+            help="Also retry images whose optimization failed.",
+        )
+        parser.add_argument(
+            "--missing-hashes",
+            action="store_true",
+            help="Also reprocess images optimized before perceptual hashes existed.",
+        )
+        parser.add_argument(
+            "--stale-after",
+            type=int,
+            default=60,
+            help=(
+                "Minutes after which an image still processing is deemed left "
+                "by a stopped server and processed again (default: 60)."
+            ),
+        )
+
+    def handle(self, *args, **options):
+        statuses = [Image.STATUS_PENDING]
+        if options["retry_failed"]:
+            statuses.append(Image.STATUS_FAILED)
+        # Left "processing" by a server that stopped mid-way. Recent ones may
+        # still be running in a worker, so they are left alone.
+        cutoff = timezone.now() - timedelta(minutes=options["stale_after"])
+        Image.objects.filter(
+            Q(processing_started_at__lt=cutoff) | Q(processing_started_at=None),
+            status=Image.STATUS_PROCESSING,
+        ).update(status=Image.STATUS_PENDING)
+        if options["missing_hashes"]:
+            Image.objects.filter(status=Image.STATUS_READY, dhash="").update(
+                status=Image.STATUS_PENDING
+            )
+        image_ids = list(
+            Image.objects.filter(status__in=statuses)
+            .order_by("pk")
+            .values_list("pk", flat=True)
+        )
+        threads = get_executors()[1]
+        for done, _ in enumerate(threads.map(optimize_image, image_ids), 1):
+            if done % 100 == 0:
+                self.stdout.write("Processed {0} images".format(done))
+
+        ready = Image.objects.filter(
+            pk__in=image_ids, status=Image.STATUS_READY
+        ).count()
+        self.stdout.write(
+            self.style.SUCCESS(
+                "Done: {0} optimized, {1} failed.".format(ready, len(image_ids) - ready)
+            )
+        )
@@ -0,0 +1,65 @@
+from django.core.management.base import BaseCommand
+
+from ...models import Image
+from ...paths import is_sharded, relocate
+
+FIELD_NAMES = ["image", "optimized"]
+
+
+class Command(BaseCommand):
+    help = "Moves images stored in the flat static/img/ directory to sharded paths."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=200,
+            help="Number of images loaded per query.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only count the files to move.",
+        )
+
+    def handle(self, *args, **options):
+        queryset = Image.objects.order_by("pk").only("id", *FIELD_NAMES)
+        moved = failed = 0
+        last_id = 0
+        while True:
+            batch = list(queryset.filter(pk__gt=last_id)[: options["batch_size"]])
+            if not batch:
+                break
+            last_id = batch[-1].pk
+            for image in batch:
+                for field_name in FIELD_NAMES:
+                    field_file = getattr(image, field_name)
+                    if not field_file or is_sharded(field_file.name):
+                        continue
+                    if options["dry_run"] or self.move(image, field_name, field_file):
+                        moved += 1
+                    else:
+                        failed += 1
+            self.stdout.write("Checked up to image {0}, {1} files moved".format(last_id, moved))
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                "Done: {0} files {1}, {2} failed.".format(
+                    moved, "to move" if options["dry_run"] else "moved", failed
+                )
+            )
+        )
+
+    def move(self, image, field_name, field_file):
+        old_name = field_file.name
+        try:
+            new_name = relocate(field_file)
+        except Exception as e:
+            self.stderr.write("Image {0}: {1}".format(image.pk, e))
+            return False
+        # update() doesn't send post_save, and only applies if the file is unchanged.
+        updated = Image.objects.filter(pk=image.pk, **{field_name: old_name}).update(
+            **{field_name: new_name}
+        )
+        field_file.storage.delete(new_name if not updated else old_name)
+        return bool(updated)
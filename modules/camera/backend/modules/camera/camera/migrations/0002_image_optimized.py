@@ -0,0 +1,23 @@
+# Generated by Django 2.2.28 on 2026-10-18 17:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('camera', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='image',
+            name='optimized',
+            field=models.ImageField(blank=True, editable=False, upload_to='static/img/optimized/'),
+        ),
+        migrations.AddField(
+            model_name='image',
+            name='status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('processing', 'Processing'), ('ready', 'Ready'), ('failed', 'Failed')], db_index=True, default='pending', editable=False, max_length=16),
+        ),
+    ]
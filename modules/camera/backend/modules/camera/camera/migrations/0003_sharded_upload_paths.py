@@ -0,0 +1,24 @@
+# Generated by Django 2.2.28 on 2026-10-18 17:55
+
+from django.db import migrations, models
+import modules.camera.camera.paths
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('camera', '0002_image_optimized'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='image',
+            name='image',
+            field=models.ImageField(upload_to=modules.camera.camera.paths.ShardedPath('static/img')),
+        ),
+        migrations.AlterField(
+            model_name='image',
+            name='optimized',
+            field=models.ImageField(blank=True, editable=False, upload_to=modules.camera.camera.paths.ShardedPath('static/img/optimized')),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 2.2.28 on 2026-10-18 18:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('camera', '0003_sharded_upload_paths'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='image',
+            name='placeholder',
+            field=models.TextField(blank=True, editable=False),
+        ),
+    ]
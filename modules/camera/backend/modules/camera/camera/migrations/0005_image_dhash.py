@@ -0,0 +1,38 @@
+# Generated by Django 2.2.28 on 2026-10-18 19:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('camera', '0004_image_placeholder'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='image',
+            name='dhash',
+            field=models.CharField(blank=True, editable=False, max_length=16),
+        ),
+        migrations.AddField(
+            model_name='image',
+            name='dhash_0',
+            field=models.IntegerField(blank=True, db_index=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='image',
+            name='dhash_1',
+            field=models.IntegerField(blank=True, db_index=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='image',
+            name='dhash_2',
+            field=models.IntegerField(blank=True, db_index=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='image',
+            name='dhash_3',
+            field=models.IntegerField(blank=True, db_index=True, editable=False, null=True),
+        ),
+    ]
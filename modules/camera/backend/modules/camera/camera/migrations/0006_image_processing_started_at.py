@@ -0,0 +1,18 @@
+# Generated by Django 2.2.28 on 2026-10-18 21:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('camera', '0005_image_dhash'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='image',
+            name='processing_started_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+    ]
@@ -1,9 +1,76 @@
 from django.db import models
+from django.db.models import Q
 from django.conf import settings
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from .hashing import SEGMENTS, MAX_DISTANCE, distance, segments
+from .paths import ShardedPath
+
+# Most candidates compared when looking for similar images.
+SIMILAR_CANDIDATES_LIMIT = 1000
 
 class Image(models.Model):
-    image = models.ImageField(upload_to='static/img/')
+    STATUS_PENDING = "pending"
+    STATUS_PROCESSING = "processing"
+    STATUS_READY = "ready"
+    STATUS_FAILED = "failed"
+    STATUS_CHOICES = (
+        (STATUS_PENDING, "Pending"),
+        (STATUS_PROCESSING, "Processing"),
+        (STATUS_READY, "Ready"),
+        (STATUS_FAILED, "Failed"),
+    )
+
+    image = models.ImageField(upload_to=ShardedPath('static/img'))
     created_at = models.DateTimeField(auto_now_add=True)
+    # Oriented, metadata-free and recompressed copy of `image`, built in the
+    # background; `status` tells when it is ready.
+    optimized = models.ImageField(upload_to=ShardedPath('static/img/optimized'), blank=True, editable=False)
+    status = models.CharField(max_length=16, choices=STATUS_CHOICES, default=STATUS_PENDING, db_index=True, editable=False)
+    # When the image was last claimed for processing, to tell stalled runs apart.
+    processing_started_at = models.DateTimeField(null=True, blank=True, editable=False)
+    # Blurred 16px preview as a data URI, to show while the image loads.
+    placeholder = models.TextField(blank=True, editable=False)
+    # Perceptual hash, in hex, and its 16 bits segments used for lookups.
+    dhash = models.CharField(max_length=16, blank=True, editable=False)
+    dhash_0 = models.IntegerField(null=True, blank=True, db_index=True, editable=False)
+    dhash_1 = models.IntegerField(null=True, blank=True, db_index=True, editable=False)
+    dhash_2 = models.IntegerField(null=True, blank=True, db_index=True, editable=False)
+    dhash_3 = models.IntegerField(null=True, blank=True, db_index=True, editable=False)
 
     def __str__(self):
-        return "%s"%self.id
\ No newline at end of file
+        return "%s"%self.id
+
+    def set_dhash(self, dhash):
+        self.dhash = dhash
+        for i, segment in enumerate(segments(dhash) if dhash else [None] * SEGMENTS):
+            setattr(self, "dhash_%d" % i, segment)
+
+    def similar(self, max_distance=MAX_DISTANCE):
+        """
+        Returns the images whose hash is at most `max_distance` bits away,
+        closest first, as (distance, image) pairs. Only images sharing a hash
+        segment can be that close, and those are found through the indexes.
+        """
+        if not self.dhash:
+            return []
+        query = Q()
+        for i, segment in enumerate(segments(self.dhash)):
+            query |= Q(**{"dhash_%d" % i: segment})
+        candidates = Image.objects.filter(query).exclude(pk=self.pk).order_by("-pk")
+        matches = []
+        for candidate in candidates[:SIMILAR_CANDIDATES_LIMIT]:
+            candidate_distance = distance(self.dhash, candidate.dhash)
+            if candidate_distance <= max_distance:
+                matches.append((candidate_distance, candidate))
+        matches.sort(key=lambda match: match[0])
+        return matches
+
+
+@receiver(post_save, sender=Image)
+def optimize_image(sender, instance, created, **kwargs):
+    from .processing import schedule_optimization
+
+    if created:
+        schedule_optimization(instance.pk)
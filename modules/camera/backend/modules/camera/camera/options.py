@@ -0,0 +1,10 @@
+PRESIGNED_UPLOAD_EXPIRES = 3600
+MAX_UPLOAD_BYTES = 20 * 1024 * 1024
+MAX_IMAGE_PIXELS = 50 * 1000 * 1000
+ALLOWED_FORMATS = ["JPEG", "MPO", "PNG", "GIF", "WEBP"]
+OPTIMIZE_FORMAT = "JPEG"
+OPTIMIZE_QUALITY = 80
+OPTIMIZE_MAX_DIMENSION = 2048
+OPTIMIZE_WORKERS = 2
+URL_CACHE_MARGIN = 300
+URL_CACHE_TIMEOUT = 24 * 3600
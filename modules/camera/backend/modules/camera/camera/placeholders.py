@@ -0,0 +1,64 @@
+"""
+Tiny blurred previews of images, inlined as data URIs so clients can show
+something before the image itself loads.
+"""
+
+import base64
+import io
+
+import numpy
+from PIL import Image, ImageOps
+
+# Longest side of a placeholder, in pixels.
+PLACEHOLDER_SIZE = 16
+# Larger images get no placeholder rather than being decoded in full.
+MAX_PLACEHOLDER_PIXELS = 50 * 1000 * 1000
+
+
+def make_placeholder(image):
+    """
+    Downsamples a Pillow image to PLACEHOLDER_SIZE pixels on its longest side
+    by averaging blocks of pixels in NumPy, which blurs as it shrinks.
+    :return: A PNG data URI, typically under 1KB.
+    """
+    # JPEG decodes straight at a reduced scale, close to the final size. Other
+    # formats are shrunk right after decoding, so the blocks are averaged over a
+    # few thousand pixels rather than the whole image.
+    image.draft("RGB", (PLACEHOLDER_SIZE * 4, PLACEHOLDER_SIZE * 4))
+    image.thumbnail((PLACEHOLDER_SIZE * 4, PLACEHOLDER_SIZE * 4), reducing_gap=2.0)
+    image = ImageOps.exif_transpose(image)
+    image = image.convert("RGBA" if "A" in image.getbands() else "RGB")
+
+    pixels = numpy.asarray(image, dtype=numpy.float32)
+    height, width = pixels.shape[:2]
+    scale = PLACEHOLDER_SIZE / max(width, height)
+    rows = max(1, min(height, round(height * scale)))
+    columns = max(1, min(width, round(width * scale)))
+    block_height, block_width = height // rows, width // columns
+    # Crop the few pixels left over so the image splits into whole blocks.
+    blocks = pixels[: rows * block_height, : columns * block_width].reshape(
+        rows, block_height, columns, block_width, -1
+    )
+    small = blocks.mean(axis=(1, 3)).round().astype(numpy.uint8)
+
+    buffered = io.BytesIO()
+    Image.fromarray(small, image.mode).save(buffered, format="PNG", optimize=True)
+    return "data:image/png;base64," + base64.b64encode(buffered.getvalue()).decode()
+
+
+def placeholder_for(file):
+    """
+    :return: The placeholder of an image file, or "" when it can't be read as
+        an image or has more than MAX_PLACEHOLDER_PIXELS pixels.
+    """
+    try:
+        file.seek(0)
+        image = Image.open(file)
+        width, height = image.size
+        if width * height > MAX_PLACEHOLDER_PIXELS:
+            return ""
+        return make_placeholder(image)
+    except (OSError, ValueError, Image.DecompressionBombError):
+        return ""
+    finally:
+        file.seek(0)
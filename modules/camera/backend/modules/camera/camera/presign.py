@@ -0,0 +1,93 @@
+import io
+import os
+import secrets
+
+from django.core import signing
+from modules.utils import get_options
+
+from .images import MAX_UPLOAD_BYTES, InvalidImage, open_image
+from .models import Image
+
+PRESIGNED_UPLOAD_EXPIRES = get_options("camera", "PRESIGNED_UPLOAD_EXPIRES")
+
+SALT = "camera.presigned-upload"
+# Enough to reach the dimensions of any image, past JPEG's EXIF segments.
+HEADER_BYTES = 256 * 1024
+CONTENT_TYPES = {
+    ".jpg": "image/jpeg",
+    ".jpeg": "image/jpeg",
+    ".png": "image/png",
+    ".gif": "image/gif",
+    ".webp": "image/webp",
+}
+
+
+class PresignError(Exception):
+    pass
+
+
+def get_s3(storage):
+    try:
+        return storage.connection.meta.client, storage.bucket_name
+    except AttributeError:
+        raise PresignError("Presigned uploads require an S3 compatible storage.")
+
+
+def issue(file_name):
+    """
+    Signs a POST form to send an image straight to the bucket, under a fresh
+    name in the `Image.image` upload directory.
+    """
+    extension = os.path.splitext(file_name)[1].lower()
+    if extension not in CONTENT_TYPES:
+        raise PresignError("Unsupported image type.")
+    field = Image._meta.get_field("image")
+    client, bucket = get_s3(field.storage)
+    name = field.generate_filename(None, secrets.token_hex(16) + extension)
+    post = client.generate_presigned_post(
+        bucket,
+        field.storage._normalize_name(name),
+        Fields={"Content-Type": CONTENT_TYPES[extension]},
+        Conditions=[
+            {"Content-Type": CONTENT_TYPES[extension]},
+            ["content-length-range", 1, MAX_UPLOAD_BYTES],
+        ],
+        ExpiresIn=PRESIGNED_UPLOAD_EXPIRES,
+    )
+    return {
+        "url": post["url"],
+        "fields": post["fields"],
+        "token": signing.dumps(name, salt=SALT),
+        "expires_in": PRESIGNED_UPLOAD_EXPIRES,
+    }
+
+
+def confirm(token):
+    """
+    Creates the Image once its object is in the bucket, after checking from
+    its header that it is an image within the limits.
+    """
+    from botocore.exceptions import ClientError
+
+    try:
+        name = signing.loads(token, salt=SALT, max_age=PRESIGNED_UPLOAD_EXPIRES * 2)
+    except signing.BadSignature:
+        raise PresignError("Invalid or expired token.")
+
+    storage = Image._meta.get_field("image").storage
+    client, bucket = get_s3(storage)
+    key = storage._normalize_name(name)
+    try:
+        header = client.get_object(
+            Bucket=bucket, Key=key, Range="bytes=0-{0}".format(HEADER_BYTES - 1)
+        )["Body"].read()
+    except ClientError:
+        raise PresignError("The image hasn't been uploaded.")
+    try:
+        open_image(io.BytesIO(header))
+    except InvalidImage as e:
+        client.delete_object(Bucket=bucket, Key=key)
+        raise PresignError(str(e))
+    if Image.objects.filter(image=name).exists():
+        raise PresignError("This upload was confirmed already.")
+    return Image.objects.create(image=name)
@@ -0,0 +1,113 @@
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from django.core.files.base import ContentFile
+from django.db import close_old_connections, connection, transaction
+from django.utils import timezone
+
+from modules.utils import get_options
+
+from .models import Image
+from .transforms import FILE_EXTENSIONS, process
+
+OPTIMIZE_FORMAT = get_options("camera", "OPTIMIZE_FORMAT")
+OPTIMIZE_QUALITY = get_options("camera", "OPTIMIZE_QUALITY")
+OPTIMIZE_MAX_DIMENSION = get_options("camera", "OPTIMIZE_MAX_DIMENSION")
+OPTIMIZE_WORKERS = get_options("camera", "OPTIMIZE_WORKERS")
+
+logger = logging.getLogger(__name__)
+
+_executors = None
+_executors_lock = threading.Lock()
+
+
+def get_executors():
+    """
+    Returns the process pool doing the CPU work and the threads feeding it,
+    which read and write the storage and the database. Both are created on
+    first use, so forking servers don't inherit them from the master process.
+    Workers are spawned rather than forked, since the server process has
+    threads running.
+    """
+    global _executors
+    with _executors_lock:
+        if _executors is None:
+            _executors = (
+                ProcessPoolExecutor(
+                    max_workers=OPTIMIZE_WORKERS,
+                    mp_context=multiprocessing.get_context("spawn"),
+                ),
+                ThreadPoolExecutor(
+                    max_workers=OPTIMIZE_WORKERS, thread_name_prefix="camera-optimize"
+                ),
+            )
+    return _executors
+
+
+def schedule_optimization(image_id):
+    """
+    Queues the optimization of an image once the current transaction commits.
+    """
+    transaction.on_commit(
+        lambda: get_executors()[1].submit(optimize_image, image_id)
+    )
+
+
+def optimize_image(image_id):
+    close_old_connections()
+    try:
+        _optimize_image(image_id)
+    except Exception:
+        logger.exception("Unable to optimize image %s", image_id)
+        Image.objects.filter(pk=image_id).update(status=Image.STATUS_FAILED)
+    finally:
+        connection.close()
+
+
+def _optimize_image(image_id):
+    claimed = Image.objects.filter(
+        pk=image_id, status__in=[Image.STATUS_PENDING, Image.STATUS_FAILED]
+    ).update(status=Image.STATUS_PROCESSING, processing_started_at=timezone.now())
+    if not claimed:
+        return
+    image = Image.objects.get(pk=image_id)
+    with image.image.open("rb") as source:
+        data = source.read()
+
+    # Placeholders and hashes are computed here rather than at upload, which
+    # would mean decoding the whole image within the request. A single task
+    # derives them all, so the image is sent to a worker and decoded once.
+    task = get_executors()[0].submit(
+        process,
+        data,
+        OPTIMIZE_FORMAT,
+        OPTIMIZE_QUALITY,
+        OPTIMIZE_MAX_DIMENSION,
+        not image.placeholder,
+        not image.dhash,
+    )
+    optimized, image_format, image_placeholder, image_hash = task.result()
+    if image_placeholder:
+        image.placeholder = image_placeholder
+    if image_hash:
+        image.set_dhash(image_hash)
+
+    file_name = "{0}.{1}".format(
+        os.path.splitext(os.path.basename(image.image.name))[0],
+        FILE_EXTENSIONS[image_format],
+    )
+    image.optimized.save(file_name, ContentFile(optimized), save=False)
+    # update() doesn't send post_save, so the image isn't scheduled again.
+    Image.objects.filter(pk=image_id).update(
+        optimized=image.optimized.name,
+        placeholder=image.placeholder,
+        dhash=image.dhash,
+        dhash_0=image.dhash_0,
+        dhash_1=image.dhash_1,
+        dhash_2=image.dhash_2,
+        dhash_3=image.dhash_3,
+        status=Image.STATUS_READY,
+    )
@@ -1,24 +1,53 @@
+from .file_urls import URLResolvingListSerializer, URLResolvingMixin
+from .images import InvalidImage, validate_image
 from .models import Image
 from rest_framework import serializers
 
 
-class ImageSerializer(serializers.HyperlinkedModelSerializer):
+class SafeImageField(serializers.FileField):
+    """
+    Image field validating uploads from their headers, with size and pixel
+    limits, instead of DRF's ImageField which fully decodes them.
+    """
+
+    def to_internal_value(self, data):
+        file = super().to_internal_value(data)
+        try:
+            validate_image(file)
+        except InvalidImage as e:
+            raise serializers.ValidationError(str(e))
+        return file
+
+
+class ImageSerializer(URLResolvingMixin, serializers.HyperlinkedModelSerializer):
     image = serializers.SerializerMethodField()
+    optimized = serializers.SerializerMethodField()
+
+    url_fields = ("image", "optimized")
 
     def get_image(self, obj):
-        return obj.image.url
+        return self.file_url(obj.image)
+
+    def get_optimized(self, obj):
+        # Null until `status` is "ready".
+        return self.file_url(obj.optimized)
 
     class Meta:
         model = Image
+        list_serializer_class = URLResolvingListSerializer
         fields = (
             "id",
             "image",
+            "optimized",
+            "status",
+            "placeholder",
         )
 
 
 class ImageUploadSerializer(serializers.ModelSerializer):
-    image = serializers.ImageField()
+    image = SafeImageField()
 
     class Meta:
         model = Image
-        fields = ("image",)
+        fields = ("id", "image", "status", "placeholder")
+        read_only_fields = ("id", "status", "placeholder")
@@ -0,0 +1,63 @@
+"""
+Image transformations run in worker processes. Kept free of Django imports,
+so spawned workers import nothing but Pillow and NumPy.
+"""
+import io
+
+from PIL import Image, ImageOps
+
+from .hashing import dhash
+from .placeholders import make_placeholder
+
+FILE_EXTENSIONS = {"JPEG": "jpg", "PNG": "png", "WEBP": "webp"}
+
+
+def process(data, image_format, quality, max_dimension, with_placeholder, with_hash):
+    """
+    Decodes an image once and derives everything stored about it: the
+    optimized copy and, when asked, its placeholder and perceptual hash.
+    :return: A tuple of the encoded image, its format, the placeholder and the
+        hash, the last two empty when not asked for.
+    """
+    image = Image.open(io.BytesIO(data))
+    if max_dimension:
+        image.draft("RGB", (max_dimension, max_dimension))
+    icc_profile = image.info.get("icc_profile")
+    image = ImageOps.exif_transpose(image)
+    if max_dimension:
+        image.thumbnail((max_dimension, max_dimension), Image.LANCZOS)
+
+    optimized, image_format = optimize(image, image_format, quality, icc_profile)
+    image_hash = dhash(image) if with_hash else ""
+    # Last, since it shrinks the image in place.
+    image_placeholder = make_placeholder(image) if with_placeholder else ""
+    return optimized, image_format, image_placeholder, image_hash
+
+
+def optimize(image, image_format, quality, icc_profile):
+    """
+    Re-encodes an image already oriented and bounded by `process`. EXIF and
+    other metadata (location, camera serial) are dropped, only the color
+    profile is kept.
+    :return: The encoded image and its format, PNG for images with transparency
+        when JPEG is asked for.
+    """
+    has_alpha = image.mode in ("RGBA", "LA") or (
+        image.mode == "P" and "transparency" in image.info
+    )
+    if image_format == "JPEG" and has_alpha:
+        image_format = "PNG"
+    if image_format == "JPEG":
+        image = image.convert("RGB") if image.mode not in ("RGB", "L") else image
+        options = {"quality": quality, "optimize": True, "progressive": True}
+    elif image_format == "WEBP":
+        image = image.convert("RGBA") if has_alpha else image.convert("RGB")
+        options = {"quality": quality, "method": 4}
+    else:
+        options = {"optimize": True}
+    if icc_profile:
+        options["icc_profile"] = icc_profile
+
+    buffered = io.BytesIO()
+    image.save(buffered, format=image_format, **options)
+    return buffered.getvalue(), image_format
@@ -2,7 +2,12 @@
 from django.urls import path, include
 from rest_framework import routers
 
-from .viewsets import ImageViewSet, ImageUploadView
+from .viewsets import (
+    ImageViewSet,
+    ImageUploadView,
+    PresignedImageUploadView,
+    PresignedImageConfirmView,
+)
 
 
 router = routers.DefaultRouter()
@@ -10,4 +15,6 @@ router.register(r'photos/user', ImageViewSet)
 urlpatterns = [
     path('', include(router.urls)),
     path('upload_image/', ImageUploadView.as_view()),
+    path('presigned_image/', PresignedImageUploadView.as_view()),
+    path('presigned_image/confirm/', PresignedImageConfirmView.as_view()),
 ]
\ No newline at end of file
@@ -1,6 +1,10 @@
+from . import presign
+from .hashing import MAX_DISTANCE
 from .models import Image
 from .serializers import ImageSerializer, ImageUploadSerializer
 from rest_framework import viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.parsers import FileUploadParser
 from rest_framework.views import APIView
 from rest_framework import permissions, status
@@ -14,6 +18,27 @@ class ImageViewSet(viewsets.ModelViewSet):
     serializer_class = ImageSerializer
     http_method_names = ["get"]
 
+    @action(detail=True, methods=["get"])
+    def similar(self, request, *args, **kwargs):
+        """
+        Returns the images looking like this one (re-uploads, resized or
+        recompressed copies), closest first, each with its `distance`: the
+        number of differing hash bits, up to the `distance` param (0 to 3).
+        """
+        try:
+            max_distance = int(request.query_params.get("distance", MAX_DISTANCE))
+        except ValueError:
+            max_distance = -1
+        if not 0 <= max_distance <= MAX_DISTANCE:
+            raise ValidationError(
+                {"distance": "Must be between 0 and {0}.".format(MAX_DISTANCE)}
+            )
+        matches = self.get_object().similar(max_distance)
+        data = self.get_serializer([image for _, image in matches], many=True).data
+        for item, (distance, _) in zip(data, matches):
+            item["distance"] = distance
+        return Response(data)
+
 
 class ImageUploadView(APIView):
 	parser_class = (FileUploadParser,)
@@ -28,3 +53,29 @@ class ImageUploadView(APIView):
 				return Response(image_serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 		except Exception as e:
 			return Response(e.args[0], status=status.HTTP_400_BAD_REQUEST)
+
+
+class PresignedImageUploadView(APIView):
+	"""
+	Returns a form to POST the image to, directly to the S3 bucket, given its
+	`file_name`. Confirm it afterwards with the returned `token`.
+	"""
+
+	def post(self, request, *args, **kwargs):
+		try:
+			form = presign.issue(request.data.get("file_name") or "")
+		except presign.PresignError as e:
+			return Response(e.args[0], status=status.HTTP_400_BAD_REQUEST)
+		return Response(form, status=status.HTTP_201_CREATED)
+
+
+class PresignedImageConfirmView(APIView):
+	def post(self, request, *args, **kwargs):
+		try:
+			image = presign.confirm(request.data.get("token") or "")
+		except presign.PresignError as e:
+			return Response(e.args[0], status=status.HTTP_400_BAD_REQUEST)
+		return Response(
+			ImageSerializer(image, context={"request": request}).data,
+			status=status.HTTP_201_CREATED,
+		)
@@ -12,6 +12,6 @@ setup(
     name="cb_camera",
     version="0.1",
     packages=["camera"],
-    install_requires=[],
+    install_requires=["Pillow", "numpy"],
     cmdclass={"build": BuildCommand},
 )
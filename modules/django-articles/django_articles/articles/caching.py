@@ -0,0 +1,75 @@
+import hashlib
+import uuid
+
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from rest_framework.response import Response
+from modules.utils import get_options
+
+CACHE_TIMEOUT = get_options("django_articles", "CACHE_TIMEOUT")
+
+VERSION_KEY = "articles:version"
+
+
+def get_version():
+    """
+    Returns the token every cached article payload is keyed under. Replacing
+    it is how all of them are invalidated at once.
+    """
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        cache.add(VERSION_KEY, uuid.uuid4().hex, None)
+        version = cache.get(VERSION_KEY)
+    return version
+
+
+def invalidate():
+    # Wait for the commit, otherwise a concurrent request could cache the
+    # old rows again under the new version.
+    transaction.on_commit(lambda: cache.set(VERSION_KEY, uuid.uuid4().hex, None))
+
+
+def get_or_set(name, default):
+    """
+    Looks a value up in the current version, computing and storing it with
+    `default()` on a miss.
+    """
+    key = "articles:{0}:{1}".format(get_version(), name)
+    value = cache.get(key)
+    if value is None:
+        value = default()
+        cache.set(key, value, CACHE_TIMEOUT)
+    return value
+
+
+def make_etag(*parts):
+    digest = hashlib.md5(":".join(str(part) for part in parts).encode("utf-8"))
+    return '"{0}"'.format(digest.hexdigest())
+
+
+def conditional_response(request, etag, last_modified, render):
+    """
+    Answers with 304 Not Modified when the client already holds `etag`, then
+    with the cached payload, and only calls `render()` when neither applies.
+    :param last_modified: The datetime the payload was last changed.
+    :param render: Callable returning the DRF Response to cache.
+    """
+    timestamp = int(last_modified.timestamp()) if last_modified else None
+    response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+    if response is None:
+        key = "articles:{0}:payload:{1}".format(get_version(), etag)
+        data = cache.get(key)
+        if data is None:
+            response = render()
+            if response.status_code != 200:
+                return response
+            cache.set(key, response.data, CACHE_TIMEOUT)
+        else:
+            response = Response(data)
+
+    response["ETag"] = etag
+    if timestamp is not None:
+        response["Last-Modified"] = http_date(timestamp)
+    return response
@@ -0,0 +1,79 @@
+import atexit
+import logging
+import threading
+import time
+from collections import Counter
+
+from django.db import connection, models
+from django.db.models import Case, F, Value, When
+from modules.utils import get_options
+
+from .models import Article
+
+VIEW_COUNT_FLUSH_INTERVAL = get_options("django_articles", "VIEW_COUNT_FLUSH_INTERVAL")
+VIEW_COUNT_FLUSH_THRESHOLD = get_options(
+    "django_articles", "VIEW_COUNT_FLUSH_THRESHOLD"
+)
+
+logger = logging.getLogger(__name__)
+
+
+class ViewCountBuffer:
+    """
+    Aggregates article reads in memory and writes them out in one UPDATE,
+    every `interval` seconds or as soon as `threshold` articles are pending,
+    instead of issuing a write on a hot row for every read.
+    """
+
+    def __init__(self, interval, threshold):
+        self.interval = interval
+        self.threshold = threshold
+        self.counts = Counter()
+        self.lock = threading.Lock()
+        self.flusher = None
+
+    def increment(self, article_id):
+        with self.lock:
+            self.counts[article_id] += 1
+            pending = len(self.counts)
+            if self.flusher is None:
+                self.start()
+        if pending >= self.threshold:
+            self.flush()
+
+    def start(self):
+        self.flusher = threading.Thread(
+            target=self.run, name="article-view-counts", daemon=True
+        )
+        self.flusher.start()
+        atexit.register(self.flush)
+
+    def run(self):
+        while True:
+            time.sleep(self.interval)
+            try:
+                self.flush()
+            finally:
+                connection.close()
+
+    def flush(self):
+        with self.lock:
+            counts, self.counts = self.counts, Counter()
+        if not counts:
+            return
+        try:
+            Article.objects.filter(pk__in=counts).update(
+                view_count=F("view_count")
+                + Case(
+                    *[When(pk=pk, then=Value(count)) for pk, count in counts.items()],
+                    default=Value(0),
+                    output_field=models.PositiveIntegerField(),
+                )
+            )
+        except Exception:
+            logger.exception("Unable to flush article view counts")
+            with self.lock:
+                self.counts.update(counts)
+
+
+view_counts = ViewCountBuffer(VIEW_COUNT_FLUSH_INTERVAL, VIEW_COUNT_FLUSH_THRESHOLD)
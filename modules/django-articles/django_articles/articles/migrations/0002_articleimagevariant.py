@@ -0,0 +1,47 @@
+# Generated by Django 2.2.28 on 2026-10-18 10:12
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("articles", "0001_articles_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ArticleImageVariant",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("source", models.CharField(max_length=255)),
+                ("width", models.PositiveIntegerField()),
+                ("format", models.CharField(max_length=8)),
+                (
+                    "image",
+                    models.ImageField(upload_to="mediafiles/articles/variants/"),
+                ),
+                (
+                    "article",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="image_variants",
+                        to="articles.Article",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["width"],
+                "unique_together": {("article", "source", "width", "format")},
+            },
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 2.2.28 on 2026-10-18 11:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("articles", "0002_articleimagevariant"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="article",
+            index=models.Index(
+                fields=["-created_at", "-id"], name="articles_created_id_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,63 @@
+# Generated by Django 2.2.28 on 2026-10-18 11:48
+
+from django.db import migrations
+
+from modules.utils import get_options
+
+POSTGRESQL_CREATE = [
+    "ALTER TABLE articles_article ADD COLUMN search_vector tsvector",
+    "CREATE INDEX articles_article_search_idx ON articles_article "
+    "USING GIN (search_vector)",
+    "UPDATE articles_article SET search_vector = "
+    "setweight(to_tsvector(%s::regconfig, coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector(%s::regconfig, coalesce(body, '')), 'B')",
+]
+POSTGRESQL_DROP = [
+    "ALTER TABLE articles_article DROP COLUMN IF EXISTS search_vector",
+]
+SQLITE_CREATE = [
+    "CREATE VIRTUAL TABLE articles_article_fts USING fts5("
+    "title, body, tokenize='porter unicode61')",
+    "INSERT INTO articles_article_fts (rowid, title, body) "
+    "SELECT id, title, body FROM articles_article",
+]
+SQLITE_DROP = [
+    "DROP TABLE IF EXISTS articles_article_fts",
+]
+
+
+def create_search_index(apps, schema_editor):
+    connection = schema_editor.connection
+    with connection.cursor() as cursor:
+        if connection.vendor == "postgresql":
+            config = get_options("django_articles", "SEARCH_CONFIG")
+            for sql in POSTGRESQL_CREATE:
+                cursor.execute(sql, [config] * sql.count("%s"))
+        elif connection.vendor == "sqlite":
+            cursor.execute("SELECT sqlite_compileoption_used('ENABLE_FTS5')")
+            if not cursor.fetchone()[0]:
+                return
+            for sql in SQLITE_CREATE:
+                cursor.execute(sql)
+
+
+def drop_search_index(apps, schema_editor):
+    connection = schema_editor.connection
+    with connection.cursor() as cursor:
+        if connection.vendor == "postgresql":
+            for sql in POSTGRESQL_DROP:
+                cursor.execute(sql)
+        elif connection.vendor == "sqlite":
+            for sql in SQLITE_DROP:
+                cursor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("articles", "0003_article_created_id_index"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
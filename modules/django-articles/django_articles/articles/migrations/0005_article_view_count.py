@@ -0,0 +1,18 @@
+# Generated by Django 2.2.28 on 2026-10-18 12:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("articles", "0004_article_search_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="article",
+            name="view_count",
+            field=models.PositiveIntegerField(db_index=True, default=0, editable=False),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 2.2.28 on 2026-10-18 18:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("articles", "0005_article_view_count"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="article",
+            name="placeholder",
+            field=models.TextField(blank=True, editable=False),
+        ),
+    ]
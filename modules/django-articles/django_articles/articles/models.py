@@ -1,8 +1,13 @@
 from django.conf import settings
 from django.db import models
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 from modules.utils import get_options
 
+from .placeholders import placeholder_for
+
 MEDIA_UPLOAD_PATH = get_options("django_articles", "MEDIA_UPLOAD_PATH")
+IMAGE_VARIANT_UPLOAD_PATH = get_options("django_articles", "IMAGE_VARIANT_UPLOAD_PATH")
 
 
 class Article(models.Model):
@@ -23,3 +28,83 @@ class Article(models.Model):
     updated_at = models.DateTimeField(
         auto_now=True,
     )
+    view_count = models.PositiveIntegerField(
+        default=0,
+        db_index=True,
+        editable=False,
+    )
+    # Blurred 16px preview of `image` as a data URI, to show while it loads.
+    placeholder = models.TextField(
+        blank=True,
+        editable=False,
+    )
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["-created_at", "-id"], name="articles_created_id_idx"),
+        ]
+
+    def save(self, *args, **kwargs):
+        if self.image and not self.image._committed:
+            self.placeholder = placeholder_for(self.image)
+        elif not self.image:
+            self.placeholder = ""
+        super().save(*args, **kwargs)
+
+
+class ArticleImageVariant(models.Model):
+    """
+    A resized copy of `Article.image` at a fixed width and format.
+    `source` holds the name of the original the variant was built from, so
+    variants of a replaced image can be told apart and discarded.
+    """
+
+    article = models.ForeignKey(
+        Article,
+        on_delete=models.CASCADE,
+        related_name="image_variants",
+    )
+    source = models.CharField(
+        max_length=255,
+    )
+    width = models.PositiveIntegerField()
+    format = models.CharField(
+        max_length=8,
+    )
+    image = models.ImageField(upload_to=IMAGE_VARIANT_UPLOAD_PATH)
+
+    class Meta:
+        ordering = ["width"]
+        unique_together = ["article", "source", "width", "format"]
+
+    def __str__(self):
+        return f"{self.article_id} - {self.width}w {self.format}"
+
+
+@receiver(post_save, sender=Article)
+def build_article_image_variants(sender, instance, **kwargs):
+    from .variants import schedule_image_variants
+
+    schedule_image_variants(instance.pk)
+
+
+@receiver(post_save, sender=Article)
+def index_article(sender, instance, **kwargs):
+    from .search import index_article
+
+    index_article(instance)
+
+
+@receiver(post_delete, sender=Article)
+def unindex_article(sender, instance, **kwargs):
+    from .search import unindex_article
+
+    unindex_article(instance.pk)
+
+
+@receiver(post_save, sender=Article)
+@receiver(post_delete, sender=Article)
+def invalidate_article_cache(sender, instance, **kwargs):
+    from .caching import invalidate
+
+    invalidate()
@@ -1 +1,11 @@
+RECORDS_PER_PAGE = 50
+CACHE_TIMEOUT = 300
+SEARCH_CONFIG = "english"
 MEDIA_UPLOAD_PATH = "mediafiles/articles/"
+IMAGE_VARIANT_UPLOAD_PATH = "mediafiles/articles/variants/"
+IMAGE_VARIANT_WIDTHS = [320, 640, 1280]
+IMAGE_VARIANT_FORMATS = ["webp", "jpeg"]
+IMAGE_VARIANT_QUALITY = 80
+IMAGE_VARIANT_WORKERS = 2
+VIEW_COUNT_FLUSH_INTERVAL = 5
+VIEW_COUNT_FLUSH_THRESHOLD = 1000
@@ -0,0 +1,193 @@
+import re
+from collections import namedtuple
+
+from django.db import connection
+from django.db.models import Q
+from django.utils.html import escape
+from modules.utils import get_options
+
+from .models import Article
+
+SEARCH_CONFIG = get_options("django_articles", "SEARCH_CONFIG")
+
+ARTICLE_TABLE = Article._meta.db_table
+FTS_TABLE = "{0}_fts".format(ARTICLE_TABLE)
+
+# Private-use characters stand in for <mark></mark> until the text is escaped.
+HIGHLIGHT_START = "\ue000"
+HIGHLIGHT_STOP = "\ue001"
+FALLBACK_EXCERPT_LENGTH = 160
+
+# Title matches weigh more than body matches.
+SEARCH_VECTOR_SQL = (
+    "setweight(to_tsvector(%s::regconfig, coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector(%s::regconfig, coalesce(body, '')), 'B')"
+)
+
+SearchHit = namedtuple("SearchHit", ["id", "rank", "title", "body"])
+
+
+def get_backend(using=connection):
+    """
+    Returns which full-text index is available on the database: "postgresql",
+    "sqlite" (FTS5) or None when searching has to fall back to a scan.
+    """
+    if using.vendor == "postgresql":
+        return "postgresql"
+    if using.vendor == "sqlite" and FTS_TABLE in using.introspection.table_names():
+        return "sqlite"
+    return None
+
+
+def index_article(article):
+    backend = get_backend()
+    with connection.cursor() as cursor:
+        if backend == "postgresql":
+            cursor.execute(
+                "UPDATE {0} SET search_vector = {1} WHERE id = %s".format(
+                    ARTICLE_TABLE, SEARCH_VECTOR_SQL
+                ),
+                [SEARCH_CONFIG, SEARCH_CONFIG, article.pk],
+            )
+        elif backend == "sqlite":
+            cursor.execute(
+                "DELETE FROM {0} WHERE rowid = %s".format(FTS_TABLE), [article.pk]
+            )
+            cursor.execute(
+                "INSERT INTO {0} (rowid, title, body) VALUES (%s, %s, %s)".format(
+                    FTS_TABLE
+                ),
+                [article.pk, article.title, article.body],
+            )
+
+
+def unindex_article(article_id):
+    # On PostgreSQL the vector lives in the article row and goes away with it.
+    if get_backend() == "sqlite":
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "DELETE FROM {0} WHERE rowid = %s".format(FTS_TABLE), [article_id]
+            )
+
+
+def search_articles(query, limit):
+    """
+    Returns up to `limit` SearchHit tuples, best match first. `title` and
+    `body` hold the matched text, HTML-escaped, with terms wrapped in
+    <mark></mark>.
+    """
+    backend = get_backend()
+    if backend == "postgresql":
+        return _search_postgresql(query, limit)
+    if backend == "sqlite":
+        return _search_sqlite(query, limit)
+    return _search_fallback(query, limit)
+
+
+def _search_postgresql(query, limit):
+    options = "StartSel={0}, StopSel={1}".format(HIGHLIGHT_START, HIGHLIGHT_STOP)
+    # Headlines are expensive, so they are only built for the top rows.
+    sql = (
+        "SELECT a.id, hits.rank, "
+        "ts_headline(%s::regconfig, a.title, hits.query, %s), "
+        "ts_headline(%s::regconfig, a.body, hits.query, %s) "
+        "FROM ("
+        "  SELECT id, ts_rank(search_vector, query) AS rank, query"
+        "  FROM {0}, plainto_tsquery(%s::regconfig, %s) query"
+        "  WHERE search_vector @@ query"
+        "  ORDER BY rank DESC, id DESC LIMIT %s"
+        ") hits JOIN {0} a ON a.id = hits.id "
+        "ORDER BY hits.rank DESC, a.id DESC"
+    ).format(ARTICLE_TABLE)
+    params = [
+        SEARCH_CONFIG,
+        "HighlightAll=true, " + options,
+        SEARCH_CONFIG,
+        "MaxFragments=2, MaxWords=24, MinWords=8, " + options,
+        SEARCH_CONFIG,
+        query,
+        limit,
+    ]
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return [
+            SearchHit(pk, rank, _highlighted(title), _highlighted(body))
+            for pk, rank, title, body in cursor.fetchall()
+        ]
+
+
+def _search_sqlite(query, limit):
+    terms = re.findall(r"\w+", query)
+    if not terms:
+        return []
+    # Quoting every term keeps user input from being read as FTS5 syntax.
+    match = " ".join('"{0}"'.format(term) for term in terms)
+    sql = (
+        "SELECT rowid, bm25({0}, 10.0, 1.0) AS rank, "
+        "highlight({0}, 0, %s, %s), "
+        "snippet({0}, 1, %s, %s, '...', 24) "
+        "FROM {0} WHERE {0} MATCH %s ORDER BY rank LIMIT %s"
+    ).format(FTS_TABLE)
+    params = [
+        HIGHLIGHT_START,
+        HIGHLIGHT_STOP,
+        HIGHLIGHT_START,
+        HIGHLIGHT_STOP,
+        match,
+        limit,
+    ]
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        # bm25() scores better matches lower; flip it so higher is better.
+        return [
+            SearchHit(pk, -rank, _highlighted(title), _highlighted(body))
+            for pk, rank, title, body in cursor.fetchall()
+        ]
+
+
+def _search_fallback(query, limit):
+    articles = (
+        Article.objects.filter(Q(title__icontains=query) | Q(body__icontains=query))
+        .order_by("-created_at", "-id")
+        .values_list("id", "title", "body")[:limit]
+    )
+    pattern = re.compile(re.escape(query), re.IGNORECASE)
+    return [
+        SearchHit(
+            pk,
+            None,
+            _highlighted(_mark(pattern, title)),
+            _highlighted(_mark(pattern, _excerpt(pattern, body))),
+        )
+        for pk, title, body in articles
+    ]
+
+
+def _mark(pattern, text):
+    return pattern.sub(lambda m: HIGHLIGHT_START + m.group(0) + HIGHLIGHT_STOP, text)
+
+
+def _excerpt(pattern, text):
+    """
+    Returns about FALLBACK_EXCERPT_LENGTH characters of `text` around the
+    first match of `pattern`.
+    """
+    match = pattern.search(text)
+    start = max(0, match.start() - FALLBACK_EXCERPT_LENGTH // 4) if match else 0
+    excerpt = text[start : start + FALLBACK_EXCERPT_LENGTH]
+    if start > 0:
+        excerpt = "..." + excerpt
+    if start + FALLBACK_EXCERPT_LENGTH < len(text):
+        excerpt += "..."
+    return excerpt
+
+
+def _highlighted(text):
+    """
+    Escapes `text` for HTML, then turns the highlight sentinels into
+    <mark></mark> tags.
+    """
+    if text is None:
+        return None
+    text = escape(text)
+    return text.replace(HIGHLIGHT_START, "<mark>").replace(HIGHLIGHT_STOP, "</mark>")
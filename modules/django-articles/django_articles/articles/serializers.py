@@ -48,18 +48,71 @@ class Base64ImageField(serializers.ImageField):
         return extension
 
 
-class ArticleSerializer(serializers.ModelSerializer):
+class ArticleSummarySerializer(serializers.ModelSerializer):
     image = Base64ImageField(max_length=None, required=False)
+    image_srcset = serializers.SerializerMethodField()
+
+    def get_image_srcset(self, obj):
+        """
+        Maps each variant format to its resized URLs keyed by width, i.e.
+        {"webp": {"320": ".../photo_320w.webp", "640": ...}, "jpeg": {...}}
+        Variants are built in the background, so this is empty right after upload.
+        """
+        srcset = {}
+        if not obj.image:
+            return srcset
+        # Absolute when there is a request, like the `image` URL.
+        request = self.context.get("request")
+        for variant in obj.image_variants.all():
+            if variant.source == obj.image.name:
+                url = variant.image.url
+                if request is not None:
+                    url = request.build_absolute_uri(url)
+                srcset.setdefault(variant.format, {})[str(variant.width)] = url
+        return srcset
 
     class Meta:
         model = Article
+        fields = [
+            "id",
+            "title",
+            "author",
+            "image",
+            "image_srcset",
+            "placeholder",
+            "created_at",
+        ]
+        read_only_fields = ["id", "placeholder"]
+
+
+class ArticleSerializer(ArticleSummarySerializer):
+    class Meta(ArticleSummarySerializer.Meta):
         fields = [
             "id",
             "title",
             "body",
             "author",
             "image",
+            "image_srcset",
+            "placeholder",
             "created_at",
             "updated_at",
         ]
-        read_only_fields = ["id"]
+
+
+class ArticleSearchResultSerializer(ArticleSummarySerializer):
+    rank = serializers.FloatField(source="search_hit.rank", read_only=True)
+    title_highlight = serializers.CharField(source="search_hit.title", read_only=True)
+    body_highlight = serializers.CharField(source="search_hit.body", read_only=True)
+
+    class Meta(ArticleSummarySerializer.Meta):
+        fields = ArticleSummarySerializer.Meta.fields + [
+            "rank",
+            "title_highlight",
+            "body_highlight",
+        ]
+
+
+class ArticleMostReadSerializer(ArticleSummarySerializer):
+    class Meta(ArticleSummarySerializer.Meta):
+        fields = ArticleSummarySerializer.Meta.fields + ["view_count"]
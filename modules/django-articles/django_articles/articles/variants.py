@@ -0,0 +1,147 @@
+import io
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.files.base import ContentFile
+from django.db import IntegrityError, close_old_connections, connection, transaction
+from django.utils import timezone
+from PIL import Image, ImageOps
+from modules.utils import get_options
+
+from . import caching
+from .models import Article, ArticleImageVariant
+
+IMAGE_VARIANT_WIDTHS = get_options("django_articles", "IMAGE_VARIANT_WIDTHS")
+IMAGE_VARIANT_FORMATS = get_options("django_articles", "IMAGE_VARIANT_FORMATS")
+IMAGE_VARIANT_QUALITY = get_options("django_articles", "IMAGE_VARIANT_QUALITY")
+IMAGE_VARIANT_WORKERS = get_options("django_articles", "IMAGE_VARIANT_WORKERS")
+
+FILE_EXTENSIONS = {"jpeg": "jpg", "webp": "webp"}
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    """
+    Returns the process-wide worker pool, creating it on first use so that
+    forking servers don't inherit threads from the master process.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=IMAGE_VARIANT_WORKERS,
+                thread_name_prefix="article-variants",
+            )
+    return _executor
+
+
+def schedule_image_variants(article_id):
+    """
+    Queues variant generation for an article once the current transaction
+    commits, so the worker never reads a row that may still be rolled back.
+    """
+    transaction.on_commit(
+        lambda: get_executor().submit(build_image_variants, article_id)
+    )
+
+
+def build_image_variants(article_id):
+    close_old_connections()
+    try:
+        _build_image_variants(article_id)
+    except Exception:
+        logger.exception("Unable to build image variants for article %s", article_id)
+    finally:
+        connection.close()
+
+
+def _build_image_variants(article_id):
+    article = Article.objects.filter(pk=article_id).only("id", "image").first()
+    if article is None:
+        return
+
+    source = article.image.name if article.image else ""
+    stale = article.image_variants.exclude(source=source)
+    if stale.exists():
+        _delete_variants(stale)
+        _touch(article)
+    if not source or article.image_variants.filter(source=source).exists():
+        return
+
+    widths = sorted(set(IMAGE_VARIANT_WIDTHS))
+    with article.image.open("rb") as image_file:
+        original = Image.open(image_file)
+        # JPEG can decode straight at a reduced scale, skipping most of the work.
+        original.draft("RGB", (widths[-1], widths[-1]))
+        original = ImageOps.exif_transpose(original)
+
+    base_name = os.path.splitext(os.path.basename(source))[0]
+    variants = []
+    for width in widths:
+        if width >= original.width:
+            break
+        height = max(1, round(original.height * width / original.width))
+        resized = original.resize((width, height), Image.LANCZOS)
+        for image_format in IMAGE_VARIANT_FORMATS:
+            variant = ArticleImageVariant(
+                article=article, source=source, width=width, format=image_format
+            )
+            file_name = "{0}_{1}w.{2}".format(
+                base_name, width, FILE_EXTENSIONS[image_format]
+            )
+            variant.image.save(
+                file_name, ContentFile(encode_image(resized, image_format)), save=False
+            )
+            variants.append(variant)
+
+    try:
+        ArticleImageVariant.objects.bulk_create(variants, ignore_conflicts=True)
+    except IntegrityError:
+        # The article was deleted meanwhile, its variant files have no row.
+        for variant in variants:
+            variant.image.delete(save=False)
+        if Article.objects.filter(pk=article_id).exists():
+            raise
+        return
+    if variants:
+        _touch(article)
+
+
+def encode_image(image, image_format):
+    buffered = io.BytesIO()
+    if image_format == "jpeg":
+        if image.mode != "RGB":
+            image = image.convert("RGB")
+        image.save(
+            buffered,
+            format="JPEG",
+            quality=IMAGE_VARIANT_QUALITY,
+            optimize=True,
+            progressive=True,
+        )
+    else:
+        if image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGBA")
+        image.save(buffered, format="WEBP", quality=IMAGE_VARIANT_QUALITY)
+    return buffered.getvalue()
+
+
+def _touch(article):
+    """
+    Bumps `updated_at` so clients holding the previous ETag refetch the new
+    srcset. `update()` doesn't send post_save, so variants aren't rescheduled.
+    """
+    Article.objects.filter(pk=article.pk).update(updated_at=timezone.now())
+    caching.invalidate()
+
+
+def _delete_variants(queryset):
+    for variant in queryset:
+        variant.image.delete(save=False)
+    queryset.delete()
@@ -1,6 +1,20 @@
+from django.db.models import Count, Max
+from django.http import Http404
 from rest_framework import authentication, permissions
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from . import caching
+from .counters import view_counts
 from .models import Article
-from .serializers import ArticleSerializer
+from .pagination import ArticleKeysetPagination
+from .search import search_articles
+from .serializers import (
+    ArticleMostReadSerializer,
+    ArticleSearchResultSerializer,
+    ArticleSerializer,
+    ArticleSummarySerializer,
+)
 from rest_framework import viewsets
 
 
@@ -11,4 +25,106 @@ class ArticleViewSet(viewsets.ModelViewSet):
         authentication.SessionAuthentication,
         authentication.TokenAuthentication,
     )
-    queryset = Article.objects.all()
+    queryset = Article.objects.prefetch_related("image_variants")
+    pagination_class = ArticleKeysetPagination
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action in ("list", "search", "most_read"):
+            # The body is only served from the detail route.
+            queryset = queryset.defer("body")
+        return queryset
+
+    def get_serializer_class(self):
+        if self.action == "list":
+            return ArticleSummarySerializer
+        if self.action == "search":
+            return ArticleSearchResultSerializer
+        if self.action == "most_read":
+            return ArticleMostReadSerializer
+        return super().get_serializer_class()
+
+    def list(self, request, *args, **kwargs):
+        """
+        Summaries are served from cache and carry ETag/Last-Modified headers
+        built from the newest `updated_at`, so unchanged feeds answer 304.
+        """
+        validators = caching.get_or_set(
+            "validators",
+            lambda: Article.objects.aggregate(
+                last_modified=Max("updated_at"), count=Count("id")
+            ),
+        )
+        etag = caching.make_etag(
+            "list",
+            validators["last_modified"],
+            validators["count"],
+            request.build_absolute_uri(),
+            request.accepted_renderer.format,
+        )
+        return caching.conditional_response(
+            request,
+            etag,
+            validators["last_modified"],
+            lambda: super(ArticleViewSet, self).list(request, *args, **kwargs),
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        try:
+            lookup = int(kwargs[self.lookup_url_kwarg or self.lookup_field])
+        except ValueError:
+            raise Http404
+        updated_at = caching.get_or_set(
+            "updated_at:{0}".format(lookup),
+            lambda: Article.objects.filter(pk=lookup)
+            .values_list("updated_at", flat=True)
+            .first(),
+        )
+        if updated_at is None:
+            return super().retrieve(request, *args, **kwargs)
+        # Reads are counted even when answered with 304.
+        view_counts.increment(lookup)
+        etag = caching.make_etag(
+            "detail", lookup, updated_at, request.accepted_renderer.format
+        )
+        return caching.conditional_response(
+            request,
+            etag,
+            updated_at,
+            lambda: super(ArticleViewSet, self).retrieve(request, *args, **kwargs),
+        )
+
+    @action(detail=False, methods=["get"])
+    def search(self, request, *args, **kwargs):
+        """
+        Full-text search over titles and bodies, best match first.
+        :param request: `q` holds the search terms, `records` caps the number of results.
+        """
+        query = request.query_params.get("q", "").strip()
+        if not query:
+            raise ValidationError({"q": "This query parameter is required."})
+        limit = self.paginator.get_page_size(request)
+
+        hits = search_articles(query, limit)
+        articles = self.get_queryset().in_bulk([hit.id for hit in hits])
+        results = []
+        for hit in hits:
+            article = articles.get(hit.id)
+            if article is not None:
+                article.search_hit = hit
+                results.append(article)
+
+        serializer = self.get_serializer(results, many=True)
+        return Response({"results": serializer.data})
+
+    @action(detail=False, methods=["get"], url_path="most-read")
+    def most_read(self, request, *args, **kwargs):
+        """
+        Most read articles first. Counts are flushed every few seconds, so
+        they may lag slightly behind.
+        :param request: `records` caps the number of results.
+        """
+        limit = self.paginator.get_page_size(request)
+        queryset = self.get_queryset().order_by("-view_count", "-id")[:limit]
+        serializer = self.get_serializer(queryset, many=True)
+        return Response({"results": serializer.data})
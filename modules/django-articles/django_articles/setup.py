@@ -13,6 +13,6 @@ setup(
     name="cb_django_articles",
     version="0.1",
     packages=["articles"],
-    install_requires=[],
+    install_requires=["Pillow", "numpy"],
     cmdclass={"build": BuildCommand},
 )
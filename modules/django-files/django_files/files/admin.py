@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from .models import FileUpload
+from .models import FileUpload, StorageUsage
 
 
 class FileUploadAdmin(admin.ModelAdmin):
@@ -10,9 +10,21 @@ class FileUploadAdmin(admin.ModelAdmin):
     ]
     list_filter = [
         "user",
+        "content_type",
         "created_at",
     ]
     search_fields = ["user", "title"]
 
 
 admin.site.register(FileUpload, FileUploadAdmin)
+
+
+class StorageUsageAdmin(admin.ModelAdmin):
+    list_display = ["user", "bytes_used", "file_count", "quota", "updated_at"]
+    list_select_related = [
+        "user",
+    ]
+    readonly_fields = ["bytes_used", "file_count"]
+
+
+admin.site.register(StorageUsage, StorageUsageAdmin)
@@ -0,0 +1,78 @@
+import os
+
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import FileBlob
+
+
+def store(file, checksum, size, content_type):
+    """
+    Returns the blob holding content with `checksum`, writing `file` to the
+    storage only when no such blob exists yet.
+    """
+    blob = FileBlob.objects.filter(checksum=checksum).first()
+    if blob is not None:
+        touch(blob.pk)
+        return blob
+
+    blob = FileBlob(checksum=checksum, size=size, content_type=content_type)
+    blob.file.save(os.path.basename(file.name), file, save=False)
+    try:
+        with transaction.atomic():
+            blob.save()
+    except IntegrityError:
+        # The same content was stored concurrently, keep that copy.
+        blob.file.delete(save=False)
+        blob = FileBlob.objects.get(checksum=checksum)
+    return blob
+
+
+def acquire(blob_id):
+    if blob_id is not None:
+        FileBlob.objects.filter(pk=blob_id).update(
+            ref_count=F("ref_count") + 1, updated_at=timezone.now()
+        )
+
+
+def release(blob_id):
+    if blob_id is not None:
+        FileBlob.objects.filter(pk=blob_id, ref_count__gt=0).update(
+            ref_count=F("ref_count") - 1, updated_at=timezone.now()
+        )
+
+
+def touch(blob_id):
+    """
+    Marks a blob as recently used, so the collector leaves it alone while an
+    upload is about to reference it.
+    """
+    FileBlob.objects.filter(pk=blob_id).update(updated_at=timezone.now())
+
+
+def collect_orphans(older_than, dry_run=False):
+    """
+    Deletes blobs no upload has referenced since `older_than`, along with
+    their files.
+    :return: The number of blobs deleted.
+    """
+    candidates = FileBlob.objects.filter(
+        ref_count=0, updated_at__lt=older_than, uploads__isnull=True
+    ).values_list("pk", flat=True)
+    deleted = 0
+    for blob_id in list(candidates.iterator()):
+        with transaction.atomic():
+            blob = (
+                FileBlob.objects.select_for_update()
+                .filter(pk=blob_id, ref_count=0, updated_at__lt=older_than)
+                .first()
+            )
+            if blob is None or blob.uploads.exists():
+                continue
+            if not dry_run:
+                storage, name = blob.file.storage, blob.file.name
+                blob.delete()
+                transaction.on_commit(lambda s=storage, n=name: s.delete(n))
+            deleted += 1
+    return deleted
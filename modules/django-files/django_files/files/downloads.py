@@ -0,0 +1,150 @@
+import os
+import re
+from urllib.parse import quote
+
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_http_date_safe
+
+from modules.utils import get_options
+
+from .metadata import DEFAULT_CONTENT_TYPE
+
+DOWNLOAD_SENDFILE_HEADER = get_options("files", "DOWNLOAD_SENDFILE_HEADER")
+DOWNLOAD_ACCEL_PREFIX = get_options("files", "DOWNLOAD_ACCEL_PREFIX")
+
+RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+BLOCK_SIZE = 64 * 1024
+
+
+class RangeNotSatisfiable(Exception):
+    pass
+
+
+def parse_range(header, size):
+    """
+    Parses a single-range `Range` header against a file of `size` bytes.
+    :return: Inclusive (start, end) offsets, or None when the header should be
+        ignored and the whole file served (missing, malformed or multi-range).
+    :raises RangeNotSatisfiable: When the range lies outside of the file.
+    """
+    match = RANGE_RE.match(header.strip()) if header else None
+    if match is None:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        # Suffix range, "bytes=-500" is the last 500 bytes.
+        length = int(last)
+        if length == 0 or size == 0:
+            raise RangeNotSatisfiable()
+        return max(0, size - length), size - 1
+    start = int(first)
+    if last and int(last) < start:
+        return None
+    if start >= size:
+        raise RangeNotSatisfiable()
+    end = int(last) if last else size - 1
+    return start, min(end, size - 1)
+
+
+def if_range_matches(header, etag, last_modified):
+    """
+    Whether the representation named in `If-Range` is still current, in which
+    case the range applies; otherwise the whole file has to be sent.
+    """
+    if not header:
+        return True
+    if header.startswith('"') or header.startswith("W/"):
+        # Only strong validators can be used with ranges.
+        return etag is not None and header == etag
+    return parse_http_date_safe(header) == last_modified
+
+
+def read_range(file, start, length):
+    try:
+        file.seek(start)
+        while length > 0:
+            block = file.read(min(BLOCK_SIZE, length))
+            if not block:
+                break
+            length -= len(block)
+            yield block
+    finally:
+        file.close()
+
+
+def serve(request, upload):
+    """
+    Returns a response streaming `upload.file`, honoring conditional and
+    `Range` requests. Full files go through `FileResponse`, which WSGI servers
+    hand to `sendfile()` where the storage is on local disk. With
+    DOWNLOAD_SENDFILE_HEADER set, the front proxy serves the file instead.
+    """
+    file = upload.file
+    size = upload.size if upload.size is not None else file.size
+    etag = '"{0}"'.format(upload.checksum) if upload.checksum else None
+    last_modified = int(upload.updated_at.timestamp())
+    content_type = upload.content_type or DEFAULT_CONTENT_TYPE
+
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is None:
+        response = delegate(file, content_type) or stream(
+            request, file, size, etag, last_modified, content_type
+        )
+        response["Content-Disposition"] = "inline; filename*=UTF-8''{0}".format(
+            quote(os.path.basename(file.name))
+        )
+        response["Accept-Ranges"] = "bytes"
+
+    if etag:
+        response["ETag"] = etag
+    response["Last-Modified"] = http_date(last_modified)
+    return response
+
+
+def delegate(file, content_type):
+    """
+    Hands the file over to the front proxy, which then takes care of ranges.
+    :return: The response, or None if it has to be served by Django.
+    """
+    if DOWNLOAD_SENDFILE_HEADER == "X-Accel-Redirect":
+        location = DOWNLOAD_ACCEL_PREFIX + quote(file.name)
+    elif DOWNLOAD_SENDFILE_HEADER == "X-Sendfile":
+        try:
+            location = file.path
+        except NotImplementedError:
+            # Not stored on the local filesystem.
+            return None
+    else:
+        return None
+    response = HttpResponse(content_type=content_type)
+    response[DOWNLOAD_SENDFILE_HEADER] = location
+    return response
+
+
+def stream(request, file, size, etag, last_modified, content_type):
+    try:
+        byte_range = parse_range(request.META.get("HTTP_RANGE"), size)
+    except RangeNotSatisfiable:
+        response = HttpResponse(status=416)
+        response["Content-Range"] = "bytes */{0}".format(size)
+        return response
+    if byte_range and not if_range_matches(
+        request.META.get("HTTP_IF_RANGE"), etag, last_modified
+    ):
+        byte_range = None
+
+    handle = file.storage.open(file.name, "rb")
+    if byte_range is None:
+        return FileResponse(handle, content_type=content_type)
+
+    start, end = byte_range
+    length = end - start + 1
+    response = StreamingHttpResponse(
+        read_range(handle, start, length), status=206, content_type=content_type
+    )
+    response["Content-Range"] = "bytes {0}-{1}/{2}".format(start, end, size)
+    response["Content-Length"] = length
+    return response
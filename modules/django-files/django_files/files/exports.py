@@ -0,0 +1,59 @@
+import os
+import zipfile
+
+from django.utils import timezone
+
+
+class ZipStream:
+    """
+    Write-only file object handed to ZipFile. Instead of keeping the archive,
+    it holds only what was written since the last `drain()`. Having no `tell()`
+    or `seek()`, ZipFile writes it sequentially with data descriptors.
+    """
+
+    def __init__(self):
+        self.buffer = []
+
+    def write(self, data):
+        self.buffer.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b"".join(self.buffer)
+        self.buffer = []
+        return data
+
+
+def archive_name(upload):
+    return "{0}_{1}".format(upload.pk, os.path.basename(upload.file.name))
+
+
+def zip_uploads(uploads):
+    """
+    Yields a ZIP archive of the files of `uploads` as it is built, one storage
+    chunk at a time, so memory use doesn't grow with the archive. Files are
+    stored as is, since most uploads (PDFs, images, videos) are already
+    compressed. Files missing from the storage are skipped.
+    """
+    stream = ZipStream()
+    with zipfile.ZipFile(stream, mode="w", allowZip64=True) as archive:
+        for upload in uploads:
+            try:
+                source = upload.file.storage.open(upload.file.name, "rb")
+            except OSError:
+                continue
+            created_at = timezone.localtime(upload.created_at)
+            info = zipfile.ZipInfo(archive_name(upload), created_at.timetuple()[:6])
+            info.compress_type = zipfile.ZIP_STORED
+            info.file_size = upload.size or 0
+            with source, archive.open(
+                info, mode="w", force_zip64=upload.size is None
+            ) as target:
+                for chunk in source.chunks():
+                    target.write(chunk)
+                    yield stream.drain()
+    # Closing the archive wrote its central directory.
+    yield stream.drain()
@@ -0,0 +1,71 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+
+from ...metadata import describe_file
+from ...models import FileUpload
+
+
+class Command(BaseCommand):
+    help = (
+        "Computes size, checksum and content type of uploads stored before "
+        "they were recorded at write time."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=100,
+            help="Number of uploads updated per query.",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=8,
+            help="Number of files read from the storage in parallel.",
+        )
+
+    def handle(self, *args, **options):
+        queryset = (
+            FileUpload.objects.filter(checksum="")
+            .exclude(file="")
+            .exclude(file__isnull=True)
+            .only("id", "file")
+            .order_by("id")
+        )
+        updated = failed = 0
+        last_id = 0
+        with ThreadPoolExecutor(max_workers=options["workers"]) as executor:
+            while True:
+                batch = list(queryset.filter(id__gt=last_id)[: options["batch_size"]])
+                if not batch:
+                    break
+                last_id = batch[-1].id
+
+                described = []
+                for upload, result in zip(batch, executor.map(self.describe, batch)):
+                    if result is None:
+                        failed += 1
+                        continue
+                    upload.size, upload.checksum, upload.content_type = result
+                    described.append(upload)
+                FileUpload.objects.bulk_update(
+                    described, ["size", "checksum", "content_type"]
+                )
+                updated += len(described)
+                self.stdout.write("Updated {0} uploads".format(updated))
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                "Done: {0} updated, {1} could not be read.".format(updated, failed)
+            )
+        )
+
+    def describe(self, upload):
+        try:
+            with upload.file.open("rb") as file:
+                return describe_file(file)
+        except Exception as e:
+            self.stderr.write("Upload {0}: {1}".format(upload.pk, e))
+            return None
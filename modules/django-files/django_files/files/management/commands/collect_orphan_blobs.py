@@ -0,0 +1,29 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from ...blobs import collect_orphans
+
+
+class Command(BaseCommand):
+    help = "Deletes stored blobs that no file upload references anymore."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--grace-hours",
+            type=int,
+            default=24,
+            help="Keep blobs released less than this many hours ago.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report how many blobs would be deleted.",
+        )
+
+    def handle(self, *args, **options):
+        older_than = timezone.now() - timedelta(hours=options["grace_hours"])
+        deleted = collect_orphans(older_than, dry_run=options["dry_run"])
+        verb = "Would delete" if options["dry_run"] else "Deleted"
+        self.stdout.write(self.style.SUCCESS("{0} {1} blobs.".format(verb, deleted)))
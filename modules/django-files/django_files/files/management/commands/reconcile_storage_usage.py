@@ -0,0 +1,39 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+
+from ...quotas import reconcile
+
+
+class Command(BaseCommand):
+    help = (
+        "Recomputes each user's storage usage from their uploads, fixing totals "
+        "that drifted, i.e. after uploads were changed with bulk queries."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Number of users reconciled per transaction.",
+        )
+
+    def handle(self, *args, **options):
+        users = get_user_model().objects.order_by("pk").values_list("pk", flat=True)
+        checked = fixed = 0
+        last_id = None
+        while True:
+            batch = users if last_id is None else users.filter(pk__gt=last_id)
+            batch = list(batch[: options["batch_size"]])
+            if not batch:
+                break
+            last_id = batch[-1]
+            fixed += reconcile(batch)
+            checked += len(batch)
+            self.stdout.write("Checked {0} users".format(checked))
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                "Done: {0} users checked, {1} fixed.".format(checked, fixed)
+            )
+        )
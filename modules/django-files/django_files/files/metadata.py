@@ -0,0 +1,59 @@
+import hashlib
+import mimetypes
+
+# Leading bytes of the formats users upload the most.
+SIGNATURES = [
+    (b"%PDF-", "application/pdf"),
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"GIF87a", "image/gif"),
+    (b"GIF89a", "image/gif"),
+    (b"PK\x03\x04", "application/zip"),
+    (b"\x1f\x8b", "application/gzip"),
+    (b"ID3", "audio/mpeg"),
+    (b"OggS", "audio/ogg"),
+    (b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1", "application/x-ole-storage"),
+]
+DEFAULT_CONTENT_TYPE = "application/octet-stream"
+
+
+def sniff_content_type(head, file_name):
+    """
+    Detects the content type from the first bytes of a file, falling back on
+    its extension. Container formats (docx, xlsx, epub are zip files, old
+    Office documents are OLE) are refined by extension too.
+    """
+    guessed = mimetypes.guess_type(file_name or "")[0]
+    detected = None
+    if head[:4] == b"RIFF" and head[8:12] in (b"WEBP", b"WAVE", b"AVI "):
+        detected = {
+            b"WEBP": "image/webp",
+            b"WAVE": "audio/wav",
+            b"AVI ": "video/x-msvideo",
+        }[head[8:12]]
+    elif head[4:8] == b"ftyp":
+        detected = guessed or "video/mp4"
+    else:
+        for signature, content_type in SIGNATURES:
+            if head.startswith(signature):
+                detected = content_type
+                break
+    if detected in ("application/zip", "application/x-ole-storage") and guessed:
+        return guessed
+    return detected or guessed or DEFAULT_CONTENT_TYPE
+
+
+def describe_file(file):
+    """
+    Reads `file` once and returns its size in bytes, SHA-256 hex digest and
+    content type.
+    """
+    checksum = hashlib.sha256()
+    size = 0
+    head = b""
+    for chunk in file.chunks():
+        if len(head) < 16:
+            head += chunk[:16]
+        checksum.update(chunk)
+        size += len(chunk)
+    return size, checksum.hexdigest(), sniff_content_type(head, file.name)
@@ -0,0 +1,34 @@
+# Generated by Django 2.2.28 on 2026-10-18 14:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("files", "0002_uploadsession"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="fileupload",
+            name="size",
+            field=models.BigIntegerField(
+                blank=True, db_index=True, editable=False, null=True
+            ),
+        ),
+        migrations.AddField(
+            model_name="fileupload",
+            name="checksum",
+            field=models.CharField(
+                blank=True, db_index=True, editable=False, max_length=64
+            ),
+        ),
+        migrations.AddField(
+            model_name="fileupload",
+            name="content_type",
+            field=models.CharField(
+                blank=True, db_index=True, editable=False, max_length=128
+            ),
+        ),
+    ]
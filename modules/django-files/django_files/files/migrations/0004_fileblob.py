@@ -0,0 +1,58 @@
+# Generated by Django 2.2.28 on 2026-10-18 14:45
+
+from django.db import migrations, models
+import django.db.models.deletion
+import modules.django_files.files.models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("files", "0003_fileupload_metadata"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="FileBlob",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("checksum", models.CharField(max_length=64, unique=True)),
+                (
+                    "file",
+                    models.FileField(
+                        max_length=255,
+                        upload_to=modules.django_files.files.models.blob_path,
+                    ),
+                ),
+                ("size", models.BigIntegerField()),
+                ("content_type", models.CharField(blank=True, max_length=128)),
+                ("ref_count", models.PositiveIntegerField(db_index=True, default=0)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "verbose_name": "File Blob",
+                "verbose_name_plural": "File Blobs",
+            },
+        ),
+        migrations.AddField(
+            model_name="fileupload",
+            name="blob",
+            field=models.ForeignKey(
+                blank=True,
+                editable=False,
+                null=True,
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="uploads",
+                to="files.FileBlob",
+            ),
+        ),
+    ]
@@ -0,0 +1,69 @@
+# Generated by Django 2.2.28 on 2026-10-18 16:05
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Sum
+import django.db.models.deletion
+
+
+def compute_storage_usage(apps, schema_editor):
+    FileUpload = apps.get_model("files", "FileUpload")
+    StorageUsage = apps.get_model("files", "StorageUsage")
+    totals = (
+        FileUpload.objects.values("user_id")
+        .annotate(bytes_used=Sum("size"), file_count=Count("id"))
+        .order_by()
+    )
+    StorageUsage.objects.bulk_create(
+        (
+            StorageUsage(
+                user_id=total["user_id"],
+                bytes_used=total["bytes_used"] or 0,
+                file_count=total["file_count"],
+            )
+            for total in totals.iterator()
+        ),
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("files", "0004_fileblob"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="StorageUsage",
+            fields=[
+                (
+                    "user",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="files_storage_usage",
+                        serialize=False,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                ("bytes_used", models.BigIntegerField(default=0)),
+                ("file_count", models.IntegerField(default=0)),
+                (
+                    "quota",
+                    models.BigIntegerField(
+                        blank=True,
+                        help_text="Maximum bytes stored, overrides the default quota when set.",
+                        null=True,
+                    ),
+                ),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "verbose_name": "Storage Usage",
+                "verbose_name_plural": "Storage Usage",
+            },
+        ),
+        migrations.RunPython(compute_storage_usage, migrations.RunPython.noop),
+    ]
@@ -1,9 +1,66 @@
+import os
+import uuid
+
 from django.conf import settings
-from django.db import models
+from django.db import models, transaction
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
 
 from modules.utils import get_options
 
+from .metadata import describe_file
+
 MEDIA_UPLOAD_PATH = get_options("files", "MEDIA_UPLOAD_PATH")
+BLOB_UPLOAD_PATH = get_options("files", "BLOB_UPLOAD_PATH")
+CONTENT_ADDRESSED_STORAGE = get_options("files", "CONTENT_ADDRESSED_STORAGE")
+
+
+def blob_path(instance, filename):
+    """
+    Names a blob after its checksum, sharded in two levels of directories, i.e.
+    "blobs/9f/86/9f86d081884c7d659a2feaa0c55ad015a3bf4f1b2b0b822cd15d6c15b0f00a08.pdf"
+    """
+    checksum = instance.checksum
+    extension = os.path.splitext(filename)[1].lower()
+    return "{0}{1}/{2}/{3}{4}".format(
+        BLOB_UPLOAD_PATH, checksum[:2], checksum[2:4], checksum, extension
+    )
+
+
+class FileBlob(models.Model):
+    """
+    A stored file shared by every FileUpload with the same content, when
+    CONTENT_ADDRESSED_STORAGE is enabled. `ref_count` tracks how many uploads
+    point at it; blobs left at zero are removed by `collect_orphan_blobs`.
+    """
+
+    checksum = models.CharField(
+        max_length=64,
+        unique=True,
+    )
+    file = models.FileField(upload_to=blob_path, max_length=255)
+    size = models.BigIntegerField()
+    content_type = models.CharField(
+        max_length=128,
+        blank=True,
+    )
+    ref_count = models.PositiveIntegerField(
+        default=0,
+        db_index=True,
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+    )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+    )
+
+    class Meta:
+        verbose_name = "File Blob"
+        verbose_name_plural = "File Blobs"
+
+    def __str__(self):
+        return f"{self.checksum} | {self.size} | {self.ref_count} refs"
 
 
 class FileUpload(models.Model):
@@ -24,10 +81,32 @@ class FileUpload(models.Model):
     updated_at = models.DateTimeField(
         auto_now=True,
     )
-
-    @property
-    def size(self):
-        return self.file.size
+    blob = models.ForeignKey(
+        FileBlob,
+        on_delete=models.PROTECT,
+        related_name="uploads",
+        null=True,
+        blank=True,
+        editable=False,
+    )
+    size = models.BigIntegerField(
+        null=True,
+        blank=True,
+        editable=False,
+        db_index=True,
+    )
+    checksum = models.CharField(
+        max_length=64,
+        blank=True,
+        editable=False,
+        db_index=True,
+    )
+    content_type = models.CharField(
+        max_length=128,
+        blank=True,
+        editable=False,
+        db_index=True,
+    )
 
     class Meta:
         verbose_name = "File Upload"
@@ -36,3 +115,147 @@ class FileUpload(models.Model):
 
     def __str__(self):
         return f"{self.user} - {self.title} | {self.size} | {self.created_at}"
+
+    # Owner and size as stored, to charge the difference to the storage ledger.
+    # None when unknown, i.e. either was deferred.
+    _stored_usage = None
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        if "user_id" in instance.__dict__ and "size" in instance.__dict__:
+            instance._stored_usage = (instance.user_id, instance.size or 0)
+        return instance
+
+    def get_stored_usage(self):
+        if self._state.adding:
+            return None, 0
+        if self._stored_usage is None:
+            stored = (
+                FileUpload.objects.filter(pk=self.pk)
+                .values_list("user_id", "size")
+                .first()
+            )
+            self._stored_usage = (stored[0], stored[1] or 0) if stored else (None, 0)
+        return self._stored_usage
+
+    def save(self, *args, **kwargs):
+        from .blobs import acquire, release, store
+        from .quotas import charge
+
+        stored_usage = self.get_stored_usage()
+        previous_blob_id = None if self._state.adding else self.blob_id
+        if not self._state.adding and not (self.file and self.file._committed):
+            # The file is being replaced or cleared, find what it pointed at.
+            previous_blob_id = (
+                FileUpload.objects.filter(pk=self.pk)
+                .values_list("blob_id", flat=True)
+                .first()
+            )
+
+        # Describe new files while they are still local, so listing them
+        # never needs a round-trip to the storage.
+        if self.file and not self.file._committed:
+            self.size, self.checksum, self.content_type = describe_file(self.file)
+            self.blob = None
+            if CONTENT_ADDRESSED_STORAGE:
+                self.blob = store(
+                    self.file, self.checksum, self.size, self.content_type
+                )
+                self.file = self.blob.file.name
+        elif not self.file:
+            self.size, self.checksum, self.content_type = None, "", ""
+            self.blob = None
+
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if self.blob_id != previous_blob_id:
+                acquire(self.blob_id)
+                release(previous_blob_id)
+            usage = (self.user_id, self.size or 0)
+            charge(stored_usage, usage)
+        self._stored_usage = usage
+
+
+class UploadSession(models.Model):
+    """
+    A resumable upload in progress. Received bytes are appended to a partial
+    file outside of the storage until `offset` reaches `size`.
+    """
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="files_upload_sessions",
+    )
+    title = models.CharField(
+        max_length=256,
+    )
+    description = models.TextField()
+    file_name = models.CharField(
+        max_length=256,
+    )
+    size = models.BigIntegerField()
+    offset = models.BigIntegerField(
+        default=0,
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+    )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+    )
+
+    class Meta:
+        verbose_name = "Upload Session"
+        verbose_name_plural = "Upload Sessions"
+
+    def __str__(self):
+        return f"{self.user} - {self.file_name} | {self.offset}/{self.size}"
+
+
+class StorageUsage(models.Model):
+    """
+    Running total of the bytes and uploads each user stores, kept up to date
+    as uploads are saved and deleted, so quotas are checked with a single row
+    lookup. `quota` overrides USER_STORAGE_QUOTA for this user.
+    """
+
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="files_storage_usage",
+    )
+    bytes_used = models.BigIntegerField(
+        default=0,
+    )
+    file_count = models.IntegerField(
+        default=0,
+    )
+    quota = models.BigIntegerField(
+        null=True,
+        blank=True,
+        help_text="Maximum bytes stored, overrides the default quota when set.",
+    )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+    )
+
+    class Meta:
+        verbose_name = "Storage Usage"
+        verbose_name_plural = "Storage Usage"
+
+    def __str__(self):
+        return f"{self.user} | {self.bytes_used} bytes | {self.file_count} files"
+
+
+@receiver(post_delete, sender=FileUpload)
+def release_file_blob(sender, instance, **kwargs):
+    from .blobs import release
+    from .quotas import charge
+
+    release(instance.blob_id)
+    if instance._stored_usage is not None:
+        charge(instance._stored_usage, (None, 0))
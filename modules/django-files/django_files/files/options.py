@@ -1 +1,9 @@
 MEDIA_UPLOAD_PATH = "uploads/"
+UPLOAD_CHUNK_DIR = ""
+UPLOAD_MAX_CHUNK_SIZE = 8 * 1024 * 1024
+CONTENT_ADDRESSED_STORAGE = False
+BLOB_UPLOAD_PATH = "blobs/"
+DOWNLOAD_SENDFILE_HEADER = ""
+DOWNLOAD_ACCEL_PREFIX = "/protected/"
+USER_STORAGE_QUOTA = None
+PRESIGNED_UPLOAD_EXPIRES = 3600
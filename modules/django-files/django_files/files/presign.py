@@ -0,0 +1,112 @@
+from django.core import signing
+
+from modules.utils import get_options
+
+from . import quotas
+from .metadata import DEFAULT_CONTENT_TYPE, sniff_content_type
+from .models import MEDIA_UPLOAD_PATH, FileUpload
+from .uploads import unique_file_name
+
+PRESIGNED_UPLOAD_EXPIRES = get_options("files", "PRESIGNED_UPLOAD_EXPIRES")
+
+SALT = "files.presigned-upload"
+
+
+class PresignError(Exception):
+    pass
+
+
+def get_s3(storage):
+    """
+    :return: The boto3 client and bucket of a django-storages S3 storage.
+    :raises PresignError: When the storage isn't S3 compatible.
+    """
+    try:
+        return storage.connection.meta.client, storage.bucket_name
+    except AttributeError:
+        raise PresignError("Presigned uploads require an S3 compatible storage.")
+
+
+def issue(user_id, title, description, file_name, size):
+    """
+    Signs a POST form the client sends the file to, straight to the bucket.
+    The bucket rejects bodies larger than the announced `size`.
+    :return: The form `url` and `fields`, and the `token` to confirm it with.
+    """
+    storage = FileUpload._meta.get_field("file").storage
+    client, bucket = get_s3(storage)
+    name = MEDIA_UPLOAD_PATH + unique_file_name(file_name)
+    content_type = sniff_content_type(b"", file_name)
+    post = client.generate_presigned_post(
+        bucket,
+        storage._normalize_name(name),
+        Fields={"Content-Type": content_type},
+        Conditions=[
+            {"Content-Type": content_type},
+            ["content-length-range", 1, size],
+        ],
+        ExpiresIn=PRESIGNED_UPLOAD_EXPIRES,
+    )
+    token = signing.dumps(
+        {
+            "name": name,
+            "user": user_id,
+            "title": title,
+            "description": description,
+        },
+        salt=SALT,
+    )
+    return {
+        "url": post["url"],
+        "fields": post["fields"],
+        "token": token,
+        "expires_in": PRESIGNED_UPLOAD_EXPIRES,
+    }
+
+
+def confirm(token):
+    """
+    Creates the FileUpload of a presigned upload once the object is in the
+    bucket. Size and content type come from the object itself; the checksum
+    is left for `backfill_file_metadata`, since computing it would mean
+    downloading the file.
+    :raises PresignError: When the token is invalid or expired, the object
+        is missing or was confirmed already, or it would exceed the user's
+        quota, in which case the object is deleted.
+    """
+    from botocore.exceptions import ClientError
+
+    try:
+        # Leave the client time to finish uploading after the form expires.
+        data = signing.loads(token, salt=SALT, max_age=PRESIGNED_UPLOAD_EXPIRES * 2)
+    except signing.BadSignature:
+        raise PresignError("Invalid or expired token.")
+
+    storage = FileUpload._meta.get_field("file").storage
+    client, bucket = get_s3(storage)
+    try:
+        head = client.head_object(
+            Bucket=bucket, Key=storage._normalize_name(data["name"])
+        )
+    except ClientError:
+        raise PresignError("The file hasn't been uploaded.")
+    if FileUpload.objects.filter(file=data["name"]).exists():
+        raise PresignError("This upload was confirmed already.")
+    # Checked again, since other files may have been stored since the form
+    # was issued, i.e. through other presigned forms.
+    try:
+        quotas.check(data["user"], head["ContentLength"])
+    except quotas.QuotaExceeded as e:
+        client.delete_object(Bucket=bucket, Key=storage._normalize_name(data["name"]))
+        raise PresignError(str(e))
+
+    upload = FileUpload(
+        user_id=data["user"],
+        title=data["title"],
+        description=data["description"],
+        file=data["name"],
+        size=head["ContentLength"],
+        content_type=head.get("ContentType") or DEFAULT_CONTENT_TYPE,
+    )
+    upload.save()
+    return upload
@@ -0,0 +1,123 @@
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Sum
+from django.utils import timezone
+
+from modules.utils import get_options
+
+from .models import FileUpload, StorageUsage
+
+USER_STORAGE_QUOTA = get_options("files", "USER_STORAGE_QUOTA")
+
+
+class QuotaExceeded(Exception):
+    def __init__(self, bytes_used, quota):
+        super().__init__(
+            "Storage quota exceeded: {0} of {1} bytes used.".format(bytes_used, quota)
+        )
+        self.bytes_used = bytes_used
+        self.quota = quota
+
+
+def get_usage(user_id):
+    """
+    :return: The bytes used, number of files and quota of the user, None
+        meaning unlimited.
+    """
+    usage = (
+        StorageUsage.objects.filter(user_id=user_id)
+        .values_list("bytes_used", "file_count", "quota")
+        .first()
+    )
+    bytes_used, file_count, quota = usage or (0, 0, None)
+    if quota is None:
+        quota = USER_STORAGE_QUOTA
+    return bytes_used, file_count, quota
+
+
+def check(user_id, incoming):
+    """
+    Rejects storing `incoming` more bytes for the user when it would exceed
+    their quota. Costs one primary key lookup.
+    :raises QuotaExceeded:
+    """
+    bytes_used, file_count, quota = get_usage(user_id)
+    if quota is not None and incoming > 0 and bytes_used + incoming > quota:
+        raise QuotaExceeded(bytes_used, quota)
+
+
+def adjust(user_id, bytes_delta, count_delta):
+    if user_id is None or (not bytes_delta and not count_delta):
+        return
+    updated = StorageUsage.objects.filter(user_id=user_id).update(
+        bytes_used=F("bytes_used") + bytes_delta,
+        file_count=F("file_count") + count_delta,
+        updated_at=timezone.now(),
+    )
+    if updated:
+        return
+    try:
+        with transaction.atomic():
+            StorageUsage.objects.create(
+                user_id=user_id, bytes_used=bytes_delta, file_count=count_delta
+            )
+    except IntegrityError:
+        # The user's first uploads are being saved concurrently.
+        adjust(user_id, bytes_delta, count_delta)
+
+
+def charge(before, after):
+    """
+    Moves an upload's usage in the ledger from `before` to `after`, both
+    (user_id, size) pairs, with user_id None when the upload doesn't exist.
+    """
+    (previous_user_id, previous_size), (user_id, size) = before, after
+    if previous_user_id == user_id:
+        adjust(user_id, size - previous_size, 0)
+    else:
+        adjust(previous_user_id, -previous_size, -1)
+        adjust(user_id, size, 1)
+
+
+def reconcile(user_ids):
+    """
+    Recomputes the ledger of the given users from their uploads. Their rows
+    are locked meanwhile, so uploads saved concurrently are charged on top of
+    the new totals instead of being lost.
+    :return: The number of users whose totals were wrong.
+    """
+    with transaction.atomic():
+        usages = {
+            usage.pk: usage
+            for usage in StorageUsage.objects.select_for_update().filter(
+                user_id__in=user_ids
+            )
+        }
+        totals = (
+            FileUpload.objects.filter(user_id__in=user_ids)
+            .values("user_id")
+            .annotate(bytes_used=Sum("size"), file_count=Count("id"))
+            .order_by()
+        )
+        changed, created = [], []
+        for total in totals:
+            bytes_used, file_count = total["bytes_used"] or 0, total["file_count"]
+            usage = usages.pop(total["user_id"], None)
+            if usage is None:
+                created.append(
+                    StorageUsage(
+                        user_id=total["user_id"],
+                        bytes_used=bytes_used,
+                        file_count=file_count,
+                    )
+                )
+            elif (usage.bytes_used, usage.file_count) != (bytes_used, file_count):
+                usage.bytes_used, usage.file_count = bytes_used, file_count
+                changed.append(usage)
+        # Users left have no uploads anymore.
+        for usage in usages.values():
+            if usage.bytes_used or usage.file_count:
+                usage.bytes_used = usage.file_count = 0
+                changed.append(usage)
+        StorageUsage.objects.bulk_update(changed, ["bytes_used", "file_count"])
+        StorageUsage.objects.bulk_create(created, ignore_conflicts=True)
+    return len(changed) + len(created)
@@ -1,13 +1,19 @@
 import base64
-import os
-import secrets
 
 from django.core.files.base import ContentFile
-from django.utils.text import slugify
 
 from rest_framework import serializers, exceptions
 
-from .models import FileUpload
+from . import quotas
+from .models import FileBlob, FileUpload, UploadSession
+from .uploads import unique_file_name
+
+
+def check_quota(user, incoming):
+    try:
+        quotas.check(user.pk, incoming)
+    except quotas.QuotaExceeded as e:
+        raise exceptions.ValidationError(str(e))
 
 
 class Base64FileField(serializers.FileField):
@@ -30,15 +36,9 @@ class Base64FileField(serializers.FileField):
                 except Exception:
                     raise exceptions.ValidationError("Unable to decode content.")
 
-                # Generate file name:
-                token = secrets.token_urlsafe(12)  # 12 characters are more than enough.
-                # Get the file name extension:
+                # Generate file name, keeping the original extension:
                 orig_file_name = header.split(":")[-1].strip()
-                file_name, file_extension = os.path.splitext(orig_file_name)
-                complete_file_name = "{0}_{1}{2}".format(
-                    token, slugify(file_name), file_extension
-                )
-                data = ContentFile(decoded_file, name=complete_file_name)
+                data = ContentFile(decoded_file, name=unique_file_name(orig_file_name))
 
         return super().to_internal_value(data)
 
@@ -57,5 +57,100 @@ class FileUploadSerializer(serializers.ModelSerializer):
             "created_at",
             "updated_at",
             "size",
+            "checksum",
+            "content_type",
         ]
         read_only_fields = ["id"]
+
+    def validate(self, attrs):
+        # Checked here, before the file is written to the storage.
+        instance = self.instance
+        user = attrs.get("user", getattr(instance, "user", None))
+        if "file" in attrs:
+            size = attrs["file"].size if attrs["file"] else 0
+        else:
+            # Uploads without a file count as 0 bytes.
+            size = getattr(instance, "size", None) or 0
+        if instance is not None and instance.user_id == user.pk:
+            size -= instance.size or 0
+        check_quota(user, size)
+        return attrs
+
+
+class UploadSessionSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = UploadSession
+        fields = [
+            "id",
+            "title",
+            "description",
+            "user",
+            "file_name",
+            "size",
+            "offset",
+            "created_at",
+        ]
+        read_only_fields = ["id", "offset", "created_at"]
+
+    def validate_size(self, value):
+        if value <= 0:
+            raise exceptions.ValidationError("Size must be greater than zero.")
+        return value
+
+    def validate(self, attrs):
+        check_quota(attrs["user"], attrs["size"])
+        return attrs
+
+
+class PresignedUploadSerializer(serializers.ModelSerializer):
+    file_name = serializers.CharField(max_length=256)
+    size = serializers.IntegerField(min_value=1)
+
+    class Meta:
+        model = FileUpload
+        fields = [
+            "title",
+            "description",
+            "user",
+            "file_name",
+            "size",
+        ]
+
+    def validate(self, attrs):
+        check_quota(attrs["user"], attrs["size"])
+        return attrs
+
+
+class FileFromChecksumSerializer(serializers.ModelSerializer):
+    checksum = serializers.RegexField(r"^[0-9a-f]{64}$", write_only=True)
+
+    class Meta:
+        model = FileUpload
+        fields = [
+            "title",
+            "description",
+            "user",
+            "checksum",
+        ]
+
+    def validate_checksum(self, value):
+        blob = FileBlob.objects.filter(checksum=value).first()
+        if blob is None:
+            raise exceptions.NotFound("No file with this checksum, upload its content.")
+        self.blob = blob
+        return value
+
+    def validate(self, attrs):
+        check_quota(attrs["user"], self.blob.size)
+        return attrs
+
+    def create(self, validated_data):
+        validated_data.pop("checksum")
+        return FileUpload.objects.create(
+            file=self.blob.file.name,
+            blob=self.blob,
+            size=self.blob.size,
+            checksum=self.blob.checksum,
+            content_type=self.blob.content_type,
+            **validated_data
+        )
@@ -0,0 +1,121 @@
+import os
+import secrets
+import shutil
+import tempfile
+
+from django.core.files import File
+from django.db import transaction
+from django.utils.text import slugify
+
+from modules.utils import get_options
+
+from . import quotas
+from .models import FileUpload, UploadSession
+
+UPLOAD_CHUNK_DIR = get_options("files", "UPLOAD_CHUNK_DIR")
+UPLOAD_MAX_CHUNK_SIZE = get_options("files", "UPLOAD_MAX_CHUNK_SIZE")
+
+COPY_BLOCK_SIZE = 64 * 1024
+# Chunks larger than this are buffered on disk while they are received.
+CHUNK_BUFFER_SIZE = 1024 * 1024
+
+
+class OffsetMismatch(Exception):
+    def __init__(self, offset):
+        super().__init__("Expected offset {0}.".format(offset))
+        self.offset = offset
+
+
+def unique_file_name(orig_file_name):
+    """
+    Returns a storage name for `orig_file_name` prefixed with a random token, i.e.
+    "my diapos.ppt" -> "Xk3v9s0aQbT1ZpLm_my-diapos.ppt"
+    """
+    token = secrets.token_urlsafe(12)  # 12 characters are more than enough.
+    file_name, file_extension = os.path.splitext(os.path.basename(orig_file_name))
+    return "{0}_{1}{2}".format(token, slugify(file_name), file_extension)
+
+
+def chunk_path(session):
+    return os.path.join(
+        UPLOAD_CHUNK_DIR or tempfile.gettempdir(), "{0}.part".format(session.pk)
+    )
+
+
+def append_chunk(session_id, stream, offset, length):
+    """
+    Appends `length` bytes from `stream` to the session's partial file at
+    `offset`, which must match what has been received so far. The chunk is
+    received into a temporary buffer first, so a slow client doesn't hold the
+    session's lock for the whole transfer. Whatever arrived is kept, so an
+    interrupted chunk can be resumed from the new offset.
+    :return: The updated session.
+    """
+    session = UploadSession.objects.get(pk=session_id)
+    if offset != session.offset:
+        raise OffsetMismatch(session.offset)
+    length = min(length, session.size - offset)
+
+    with tempfile.SpooledTemporaryFile(
+        max_size=CHUNK_BUFFER_SIZE, dir=UPLOAD_CHUNK_DIR or None
+    ) as buffered:
+        remaining = length
+        while remaining > 0:
+            try:
+                block = stream.read(min(COPY_BLOCK_SIZE, remaining))
+            except OSError:
+                # The client went away mid-chunk, keep what arrived.
+                break
+            if not block:
+                break
+            buffered.write(block)
+            remaining -= len(block)
+        buffered.seek(0)
+
+        with transaction.atomic():
+            session = UploadSession.objects.select_for_update().get(pk=session_id)
+            # Another request may have appended the same chunk meanwhile.
+            if offset != session.offset:
+                raise OffsetMismatch(session.offset)
+            path = chunk_path(session)
+            with open(path, "r+b" if os.path.exists(path) else "wb") as part:
+                # Drop any bytes written after the last recorded offset.
+                part.truncate(session.offset)
+                part.seek(session.offset)
+                shutil.copyfileobj(buffered, part, COPY_BLOCK_SIZE)
+                session.offset = part.tell()
+            session.save(update_fields=["offset", "updated_at"])
+    return session
+
+
+def finalize(session_id):
+    """
+    Moves the completed partial file into storage as a FileUpload. The file is
+    handed over as a stream, so the storage backend reads it chunk by chunk.
+    :return: The new FileUpload, or None if the upload is incomplete.
+    :raises quotas.QuotaExceeded: When the user has stored other files since
+        the session started. The session is kept.
+    """
+    with transaction.atomic():
+        session = UploadSession.objects.select_for_update().get(pk=session_id)
+        if session.offset != session.size:
+            return None
+        quotas.check(session.user_id, session.size)
+        with open(chunk_path(session), "rb") as part:
+            upload = FileUpload(
+                user_id=session.user_id,
+                title=session.title,
+                description=session.description,
+                file=File(part, name=unique_file_name(session.file_name)),
+            )
+            upload.save()
+        discard(session)
+    return upload
+
+
+def discard(session):
+    try:
+        os.remove(chunk_path(session))
+    except FileNotFoundError:
+        pass
+    session.delete()
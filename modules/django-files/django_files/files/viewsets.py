@@ -1,7 +1,34 @@
-from rest_framework import authentication, permissions, viewsets
+from django.http import StreamingHttpResponse
+from django.shortcuts import get_object_or_404
+from rest_framework import authentication, permissions, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.negotiation import BaseContentNegotiation
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.response import Response
 
-from .models import FileUpload
-from .serializers import FileUploadSerializer
+from . import downloads, exports, presign, quotas, uploads
+from .models import CONTENT_ADDRESSED_STORAGE, FileUpload, UploadSession
+from .serializers import (
+    FileFromChecksumSerializer,
+    FileUploadSerializer,
+    PresignedUploadSerializer,
+    UploadSessionSerializer,
+)
+
+SESSION_PATH = r"sessions/(?P<session_id>[0-9a-f-]{36})"
+
+
+class IgnoreClientContentNegotiation(BaseContentNegotiation):
+    """
+    Downloads answer with the file's own content type, whatever the client
+    accepts, instead of failing with 406 Not Acceptable.
+    """
+
+    def select_parser(self, request, parsers):
+        return parsers[0]
+
+    def select_renderer(self, request, renderers, format_suffix=None):
+        return (renderers[0], renderers[0].media_type)
 
 
 class FileUploadViewSet(viewsets.ModelViewSet):
@@ -12,3 +39,189 @@ class FileUploadViewSet(viewsets.ModelViewSet):
         authentication.TokenAuthentication,
     )
     queryset = FileUpload.objects.all()
+
+    @action(
+        detail=True,
+        methods=["get"],
+        content_negotiation_class=IgnoreClientContentNegotiation,
+    )
+    def download(self, request, *args, **kwargs):
+        """
+        Streams the file itself. Supports `Range`/`If-Range` for seeking, and
+        `If-None-Match`/`If-Modified-Since` for caching.
+        """
+        upload = self.get_object()
+        if not upload.file:
+            raise NotFound("This upload has no file.")
+        return downloads.serve(request, upload)
+
+    @action(
+        detail=False,
+        methods=["get"],
+        content_negotiation_class=IgnoreClientContentNegotiation,
+    )
+    def export(self, request, *args, **kwargs):
+        """
+        Streams a ZIP archive with the files of the uploads listed in `ids`
+        (comma separated), or of every upload of `user`.
+        """
+        queryset = FileUpload.objects.exclude(file="").exclude(file__isnull=True)
+        if request.query_params.get("ids"):
+            try:
+                ids = [int(pk) for pk in request.query_params["ids"].split(",")]
+            except ValueError:
+                raise ValidationError({"ids": "Must be a comma separated list of ids."})
+            queryset = queryset.filter(pk__in=ids)
+        elif request.query_params.get("user"):
+            try:
+                user_id = int(request.query_params["user"])
+            except ValueError:
+                raise ValidationError({"user": "This query param must be a user id."})
+            queryset = queryset.filter(user_id=user_id)
+        else:
+            raise ValidationError("Either the ids or the user query param is required.")
+
+        uploads = (
+            queryset.only("id", "file", "size", "created_at")
+            .order_by("id")
+            .iterator(chunk_size=100)
+        )
+        response = StreamingHttpResponse(
+            exports.zip_uploads(uploads), content_type="application/zip"
+        )
+        response["Content-Disposition"] = 'attachment; filename="files.zip"'
+        return response
+
+    @action(detail=False, methods=["get"])
+    def usage(self, request, *args, **kwargs):
+        """
+        Returns the storage used by `user` and their quota, null when unlimited.
+        """
+        try:
+            user_id = int(request.query_params["user"])
+        except (KeyError, ValueError):
+            raise ValidationError({"user": "This query param must be a user id."})
+        bytes_used, file_count, quota = quotas.get_usage(user_id)
+        return Response(
+            {"bytes_used": bytes_used, "file_count": file_count, "quota": quota}
+        )
+
+    @action(detail=False, methods=["post"], url_path="from-checksum")
+    def from_checksum(self, request, *args, **kwargs):
+        """
+        Creates an upload from content already stored, identified by its SHA-256
+        `checksum`, so the client can skip sending the body. Answers 404 when
+        the content is unknown and has to be uploaded.
+        """
+        if not CONTENT_ADDRESSED_STORAGE:
+            raise NotFound("Content-addressed storage is disabled.")
+        serializer = FileFromChecksumSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        upload = serializer.save()
+        return Response(
+            self.get_serializer(upload).data, status=status.HTTP_201_CREATED
+        )
+
+    @action(detail=False, methods=["post"])
+    def presigned(self, request, *args, **kwargs):
+        """
+        Returns a form to POST the file to, directly to the S3 bucket. Takes
+        the same fields as a regular upload, plus `file_name` and `size`
+        instead of the file itself. Confirm the upload afterwards.
+        """
+        serializer = PresignedUploadSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        try:
+            form = presign.issue(
+                data["user"].pk,
+                data["title"],
+                data["description"],
+                data["file_name"],
+                data["size"],
+            )
+        except presign.PresignError as e:
+            raise NotFound(str(e))
+        return Response(form, status=status.HTTP_201_CREATED)
+
+    @action(detail=False, methods=["post"], url_path="presigned/confirm")
+    def confirm_presigned(self, request, *args, **kwargs):
+        """
+        Creates the upload once the file is in the bucket, from the `token`
+        returned along with the form.
+        """
+        try:
+            upload = presign.confirm(request.data.get("token") or "")
+        except presign.PresignError as e:
+            raise ValidationError(str(e))
+        return Response(
+            self.get_serializer(upload).data, status=status.HTTP_201_CREATED
+        )
+
+    @action(detail=False, methods=["post"], url_path="sessions")
+    def create_session(self, request, *args, **kwargs):
+        """
+        Starts a resumable upload. Takes the same fields as a regular upload,
+        plus `file_name` and the total `size` in bytes instead of the file itself.
+        """
+        serializer = UploadSessionSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+    @action(detail=False, methods=["get", "put"], url_path=SESSION_PATH)
+    def session(self, request, session_id, *args, **kwargs):
+        """
+        GET returns the session, whose `offset` is where to resume from.
+        PUT appends the raw request body at the offset given in the
+        `Upload-Offset` header (or the `offset` query param).
+        """
+        session = get_object_or_404(UploadSession, pk=session_id)
+        if request.method == "GET":
+            return Response(UploadSessionSerializer(session).data)
+
+        offset = request.META.get(
+            "HTTP_UPLOAD_OFFSET", request.query_params.get("offset")
+        )
+        try:
+            offset = int(offset)
+            length = int(request.META.get("CONTENT_LENGTH") or 0)
+        except (TypeError, ValueError):
+            raise ValidationError(
+                "Upload-Offset and Content-Length headers must be integers."
+            )
+        if length > uploads.UPLOAD_MAX_CHUNK_SIZE:
+            return Response(
+                {
+                    "message": "Chunks can't exceed {0} bytes.".format(
+                        uploads.UPLOAD_MAX_CHUNK_SIZE
+                    )
+                },
+                status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            )
+
+        try:
+            session = uploads.append_chunk(session.pk, request.stream, offset, length)
+        except uploads.OffsetMismatch as e:
+            return Response({"offset": e.offset}, status=status.HTTP_409_CONFLICT)
+        response = Response({"offset": session.offset})
+        response["Upload-Offset"] = session.offset
+        return response
+
+    @action(detail=False, methods=["post"], url_path=SESSION_PATH + "/finalize")
+    def finalize_session(self, request, session_id, *args, **kwargs):
+        """
+        Stores the completed upload as a FileUpload and returns it.
+        """
+        session = get_object_or_404(UploadSession, pk=session_id)
+        try:
+            upload = uploads.finalize(session.pk)
+        except quotas.QuotaExceeded as e:
+            raise ValidationError(str(e))
+        if upload is None:
+            return Response(
+                {"message": "Upload is incomplete.", "offset": session.offset},
+                status=status.HTTP_409_CONFLICT,
+            )
+        serializer = self.get_serializer(upload)
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
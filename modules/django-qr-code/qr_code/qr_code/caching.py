@@ -0,0 +1,97 @@
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+
+from django.core.cache import cache
+from modules.utils import get_options
+
+LRU_CACHE_SIZE = get_options("qr_code", "LRU_CACHE_SIZE")
+SHARED_CACHE = get_options("qr_code", "SHARED_CACHE")
+SHARED_CACHE_TIMEOUT = get_options("qr_code", "SHARED_CACHE_TIMEOUT")
+
+
+class LRUCache:
+    """
+    Thread-safe mapping holding the `maxsize` most recently used items, with
+    hit and miss counters.
+    """
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.items = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = self.misses = 0
+
+    def get(self, key):
+        with self.lock:
+            try:
+                self.items.move_to_end(key)
+            except KeyError:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return self.items[key]
+
+    def set(self, key, value):
+        if self.maxsize <= 0:
+            return
+        with self.lock:
+            self.items[key] = value
+            self.items.move_to_end(key)
+            while len(self.items) > self.maxsize:
+                self.items.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.items.clear()
+            self.hits = self.misses = 0
+
+
+renders = LRUCache(LRU_CACHE_SIZE)
+shared_hits = 0
+
+
+def cache_key(kind, text, params):
+    """
+    Returns the key of a rendering, a hash of everything it depends on. It
+    also serves as its ETag, so repeat requests are answered before rendering.
+    """
+    payload = json.dumps([kind, text, params], sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def get_or_render(key, render):
+    """
+    Looks a rendering up in the process cache, then in the Django cache when
+    SHARED_CACHE is on, and only calls `render()` when neither has it.
+    """
+    global shared_hits
+    value = renders.get(key)
+    if value is not None:
+        return value
+    if SHARED_CACHE:
+        value = cache.get("qr_code:" + key)
+        if value is not None:
+            with renders.lock:
+                shared_hits += 1
+    if value is None:
+        value = render()
+        if SHARED_CACHE:
+            cache.set("qr_code:" + key, value, SHARED_CACHE_TIMEOUT)
+    renders.set(key, value)
+    return value
+
+
+def stats():
+    """
+    Counters of the current process: `misses` counts lookups the process
+    cache couldn't answer, `shared_hits` those of them the Django cache did.
+    """
+    return {
+        "hits": renders.hits,
+        "misses": renders.misses,
+        "shared_hits": shared_hits,
+        "size": len(renders.items),
+        "maxsize": renders.maxsize,
+    }
@@ -0,0 +1,100 @@
+import io
+
+import numpy
+from PIL import Image
+
+# Margin added around images in which no code was found, relative to their
+# longest side.
+QUIET_ZONE_MARGIN = 0.25
+
+
+class UndecodableImage(Exception):
+    pass
+
+
+def load_grayscale(data, max_pixels, max_dimension=None):
+    """
+    Decodes an image in grayscale, scaled down to fit `max_dimension` if
+    given. JPEGs are decoded at a reduced scale directly, the others resized
+    afterwards.
+    :return: The image, and whether it was scaled down.
+    :raises UndecodableImage: When the image can't be read or is larger than
+        `max_pixels`, which is checked from its header before decoding.
+    """
+    try:
+        image = Image.open(io.BytesIO(data))
+        width, height = image.size
+        if width * height > max_pixels:
+            raise UndecodableImage("The image is larger than {0} pixels.".format(max_pixels))
+        if max_dimension:
+            image.draft("L", (max_dimension, max_dimension))
+        image = image.convert("L")
+    except (OSError, SyntaxError, ValueError, Image.DecompressionBombError):
+        raise UndecodableImage("Not a valid image.")
+    downscaled = image.size != (width, height)
+    if max_dimension and max(image.size) > max_dimension:
+        image.thumbnail((max_dimension, max_dimension), Image.BILINEAR)
+        downscaled = True
+    return image, downscaled
+
+
+def detect(image):
+    """
+    Returns the payloads of the QR codes found in a grayscale image. OpenCV's
+    multi detector misses some codes, e.g. a clean code filling the whole
+    image, so when nothing is found the image is tried again padded with a
+    white margin, like a wider quiet zone.
+    """
+    pixels = numpy.asarray(image)
+    payloads = detect_pixels(pixels)
+    if not payloads:
+        margin = int(max(pixels.shape) * QUIET_ZONE_MARGIN)
+        payloads = detect_pixels(numpy.pad(pixels, margin, constant_values=255))
+    return payloads
+
+
+def detect_pixels(pixels):
+    """
+    Tries the multi code detector, then the single code one when it finds
+    nothing.
+    """
+    import cv2
+
+    detector = cv2.QRCodeDetector()
+    try:
+        found, payloads, points, straight = detector.detectAndDecodeMulti(pixels)
+        payloads = [payload for payload in payloads if payload] if found else []
+        if not payloads:
+            payload, points, straight = detector.detectAndDecode(pixels)
+            payloads = [payload] if payload else []
+    except cv2.error:
+        return []
+    return payloads
+
+
+def decode(data, max_dimension, max_pixels):
+    """
+    Returns the payloads of the QR codes found in an image. Detection runs on
+    a scaled down copy first, and at full size only when that found nothing,
+    in case the codes are too small to survive the scaling.
+    """
+    image, downscaled = load_grayscale(data, max_pixels, max_dimension)
+    payloads = detect(image)
+    if not payloads and downscaled:
+        image, downscaled = load_grayscale(data, max_pixels)
+        payloads = detect(image)
+    return payloads
+
+
+def decode_many(images, max_dimension, max_pixels):
+    """
+    Decodes a chunk of images in a worker process.
+    :return: A dict per image, with either its `codes` or an `error`.
+    """
+    results = []
+    for data in images:
+        try:
+            results.append({"codes": decode(data, max_dimension, max_pixels)})
+        except UndecodableImage as e:
+            results.append({"error": str(e)})
+    return results
@@ -0,0 +1,48 @@
+import base64
+import json
+import zipfile
+
+
+class ZipStream:
+    """
+    Write-only file object handed to ZipFile. Instead of keeping the archive,
+    it holds only what was written since the last `drain()`. Having no `tell()`
+    or `seek()`, ZipFile writes it sequentially with data descriptors.
+    """
+
+    def __init__(self):
+        self.buffer = []
+
+    def write(self, data):
+        self.buffer.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b"".join(self.buffer)
+        self.buffer = []
+        return data
+
+
+def ndjson_lines(renderings):
+    for index, text, png in renderings:
+        line = {"index": index, "text": text, "qrcode": base64.b64encode(png).decode("utf-8")}
+        yield json.dumps(line) + "\n"
+
+
+def zip_pngs(renderings, count):
+    """
+    Yields a ZIP archive of the renderings as it is built, named after their
+    index, zero-padded so they sort in order. PNGs are already compressed,
+    so they are stored as is.
+    """
+    width = len(str(count - 1))
+    stream = ZipStream()
+    with zipfile.ZipFile(stream, mode="w") as archive:
+        for index, text, png in renderings:
+            archive.writestr("{0:0{1}d}.png".format(index, width), png, zipfile.ZIP_STORED)
+            yield stream.drain()
+    # Closing the archive wrote its central directory.
+    yield stream.drain()
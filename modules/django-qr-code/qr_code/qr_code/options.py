@@ -0,0 +1,11 @@
+LRU_CACHE_SIZE = 4096
+SHARED_CACHE = False
+SHARED_CACHE_TIMEOUT = 24 * 3600
+BATCH_WORKERS = 2
+BATCH_CHUNK_SIZE = 100
+BATCH_MAX_TEXTS = 50000
+MAX_BOX_SIZE = 50
+DECODE_MAX_IMAGES = 100
+DECODE_MAX_IMAGE_BYTES = 20 * 1024 * 1024
+DECODE_MAX_IMAGE_PIXELS = 50 * 1000 * 1000
+DECODE_MAX_DIMENSION = 1024
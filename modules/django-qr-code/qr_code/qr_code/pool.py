@@ -0,0 +1,94 @@
+import itertools
+import multiprocessing
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from modules.utils import get_options
+
+from .decoding import decode_many
+from .rendering import render_many
+
+BATCH_WORKERS = get_options("qr_code", "BATCH_WORKERS")
+BATCH_CHUNK_SIZE = get_options("qr_code", "BATCH_CHUNK_SIZE")
+
+# Chunks queued per worker, enough to keep them busy without holding the
+# results of a whole batch in memory.
+CHUNKS_PER_WORKER = 2
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    """
+    Returns the process pool rendering and decoding batches, created on first use so
+    forking servers don't inherit it. Workers are spawned rather than forked,
+    since the server process has threads running.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=BATCH_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+    return _pool
+
+
+def discard_pool():
+    global _pool
+    with _pool_lock:
+        _pool = None
+
+
+def imap(function, items, chunk_size, *args):
+    """
+    Calls `function(chunk, *args)` across the pool for chunks of `chunk_size`
+    items, and yields (index, item, result) in the order of `items` as chunks
+    complete. Only a few chunks are in flight at a time, and `items` is only
+    consumed as they are submitted, so it can be a generator.
+    """
+    pool = get_pool()
+    pending = deque()
+    items = iter(items)
+    try:
+        for start in itertools.count(0, chunk_size):
+            chunk = list(itertools.islice(items, chunk_size))
+            if not chunk:
+                break
+            if len(pending) >= BATCH_WORKERS * CHUNKS_PER_WORKER:
+                yield from collect(*pending.popleft())
+            pending.append((start, chunk, pool.submit(function, chunk, *args)))
+        while pending:
+            yield from collect(*pending.popleft())
+    except BrokenProcessPool:
+        # A worker died, i.e. killed for using too much memory.
+        discard_pool()
+        raise
+    finally:
+        # The client went away, don't process the rest.
+        for start, chunk, future in pending:
+            future.cancel()
+
+
+def collect(start, chunk, future):
+    for index, (item, result) in enumerate(zip(chunk, future.result()), start):
+        yield index, item, result
+
+
+def render_all(texts, params):
+    """
+    Renders the QR codes of `texts` across the pool, BATCH_CHUNK_SIZE texts
+    per task, and yields (index, text, png) in the order of `texts`.
+    """
+    return imap(render_many, texts, BATCH_CHUNK_SIZE, params)
+
+
+def decode_all(images, max_dimension, max_pixels):
+    """
+    Decodes the QR codes of `images`, bytes of image files, across the pool
+    one image per task, and yields (index, data, result) in their order.
+    """
+    return imap(decode_many, images, 1, max_dimension, max_pixels)
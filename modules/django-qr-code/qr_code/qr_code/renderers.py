@@ -0,0 +1,23 @@
+from rest_framework.renderers import BaseRenderer
+
+from .rendering import CONTENT_TYPES
+
+
+class PNGRenderer(BaseRenderer):
+    media_type = CONTENT_TYPES["png"]
+    format = "png"
+    charset = None
+    render_style = "binary"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return data
+
+
+class SVGRenderer(BaseRenderer):
+    media_type = CONTENT_TYPES["svg"]
+    format = "svg"
+    charset = None
+    render_style = "binary"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return data
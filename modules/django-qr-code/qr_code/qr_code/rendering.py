@@ -0,0 +1,72 @@
+import io
+import itertools
+
+import qrcode
+
+DEFAULT_PARAMS = {
+    "version": 1,
+    "error_correction": qrcode.constants.ERROR_CORRECT_H,
+    "box_size": 4,
+    "border": 4,
+}
+
+CONTENT_TYPES = {"png": "image/png", "svg": "image/svg+xml"}
+
+
+def make_qr(text, version, error_correction, box_size, border):
+    """
+    Builds the QR code of `text`. `version` is the smallest one tried, larger
+    ones are used when the text doesn't fit.
+    """
+    qr = qrcode.QRCode(
+        version=version,
+        error_correction=error_correction,
+        box_size=box_size,
+        border=border,
+    )
+    qr.add_data(text)
+    qr.make(fit=True)
+    return qr
+
+
+def render_png(text, **params):
+    """
+    Returns the QR code of `text` as PNG bytes.
+    """
+    buffered = io.BytesIO()
+    make_qr(text, **params).make_image().save(buffered, format="PNG")
+    return buffered.getvalue()
+
+
+def render_svg(text, **params):
+    """
+    Returns the QR code of `text` as SVG bytes, straight from its matrix: one
+    path with a rectangle per horizontal run of dark modules, drawn in module
+    units and scaled by the viewBox.
+    """
+    matrix = make_qr(text, **params).get_matrix()
+    size = len(matrix)
+    path = []
+    for y, row in enumerate(matrix):
+        x = 0
+        for dark, run in itertools.groupby(row):
+            length = len(list(run))
+            if dark:
+                path.append("M{0} {1}h{2}v1h-{2}z".format(x, y, length))
+            x += length
+    return (
+        '<svg xmlns="http://www.w3.org/2000/svg" width="{0}" height="{0}" '
+        'viewBox="0 0 {1} {1}" shape-rendering="crispEdges">'
+        '<path fill="#fff" d="M0 0h{1}v{1}H0z"/><path d="{2}"/></svg>'
+    ).format(size * params["box_size"], size, "".join(path)).encode("utf-8")
+
+
+RENDERERS = {"png": render_png, "svg": render_svg}
+
+
+def render_many(texts, params):
+    """
+    Renders a chunk of texts in a worker process.
+    :return: The PNG bytes of each text, in order.
+    """
+    return [render_png(text, **params) for text in texts]
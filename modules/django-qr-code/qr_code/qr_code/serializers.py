@@ -0,0 +1,111 @@
+import qrcode
+from qrcode.util import BIT_LIMIT_TABLE
+from rest_framework import serializers
+
+from modules.utils import get_options
+
+from .rendering import DEFAULT_PARAMS
+
+MAX_BOX_SIZE = get_options("qr_code", "MAX_BOX_SIZE")
+BATCH_MAX_TEXTS = get_options("qr_code", "BATCH_MAX_TEXTS")
+DECODE_MAX_IMAGES = get_options("qr_code", "DECODE_MAX_IMAGES")
+DECODE_MAX_IMAGE_BYTES = get_options("qr_code", "DECODE_MAX_IMAGE_BYTES")
+
+ERROR_CORRECTION_LEVELS = {
+    "L": qrcode.constants.ERROR_CORRECT_L,
+    "M": qrcode.constants.ERROR_CORRECT_M,
+    "Q": qrcode.constants.ERROR_CORRECT_Q,
+    "H": qrcode.constants.ERROR_CORRECT_H,
+}
+
+# Bytes a version 40 code holds at each level, in byte mode: the mode and
+# length indicators take 20 bits. Texts within it always fit, whatever their
+# characters.
+CAPACITIES = {
+    level: (BIT_LIMIT_TABLE[error_correction][40] - 20) // 8
+    for level, error_correction in ERROR_CORRECTION_LEVELS.items()
+}
+
+
+def check_capacity(text, level):
+    if len(text.encode("utf-8")) > CAPACITIES[level]:
+        raise serializers.ValidationError(
+            "Too long for a QR code with error correction {0}, which holds up to {1} bytes.".format(
+                level, CAPACITIES[level]
+            )
+        )
+
+
+class QRCodeParamsSerializer(serializers.Serializer):
+    """
+    How QR codes are rendered: `version` is the smallest symbol size tried
+    (1 to 40), `box_size` the size of a module in pixels, `border` the quiet
+    zone in modules and `error_correction` one of L, M, Q or H.
+    """
+    version = serializers.IntegerField(min_value=1, max_value=40, default=DEFAULT_PARAMS["version"])
+    box_size = serializers.IntegerField(min_value=1, max_value=MAX_BOX_SIZE, default=DEFAULT_PARAMS["box_size"])
+    border = serializers.IntegerField(min_value=0, max_value=20, default=DEFAULT_PARAMS["border"])
+    error_correction = serializers.ChoiceField(choices=list(ERROR_CORRECTION_LEVELS), default="H")
+
+    def get_params(self):
+        """
+        :return: The keyword arguments of the render functions.
+        """
+        data = self.validated_data
+        return {
+            "version": data["version"],
+            "error_correction": ERROR_CORRECTION_LEVELS[data["error_correction"]],
+            "box_size": data["box_size"],
+            "border": data["border"],
+        }
+
+
+class QRCodeSerializer(QRCodeParamsSerializer):
+    text = serializers.CharField(trim_whitespace=False, max_length=max(CAPACITIES.values()))
+
+    def validate(self, attrs):
+        try:
+            check_capacity(attrs["text"], attrs["error_correction"])
+        except serializers.ValidationError as e:
+            raise serializers.ValidationError({"text": e.detail})
+        return attrs
+
+
+class QRCodeBatchSerializer(QRCodeParamsSerializer):
+    texts = serializers.ListField(
+        child=serializers.CharField(trim_whitespace=False, max_length=max(CAPACITIES.values())),
+        allow_empty=False,
+        max_length=BATCH_MAX_TEXTS,
+    )
+    output = serializers.ChoiceField(choices=["ndjson", "zip"], default="ndjson")
+
+    def validate(self, attrs):
+        # Checked before responding, since the response is streamed.
+        errors = {}
+        for index, text in enumerate(attrs["texts"]):
+            try:
+                check_capacity(text, attrs["error_correction"])
+            except serializers.ValidationError as e:
+                errors[index] = e.detail
+        if errors:
+            raise serializers.ValidationError({"texts": errors})
+        return attrs
+
+
+class ImageUploadField(serializers.FileField):
+
+    def to_internal_value(self, data):
+        file = super().to_internal_value(data)
+        if file.size > DECODE_MAX_IMAGE_BYTES:
+            raise serializers.ValidationError(
+                "Images can't be larger than {0} bytes.".format(DECODE_MAX_IMAGE_BYTES)
+            )
+        return file
+
+
+class QRCodeDecodeSerializer(serializers.Serializer):
+    images = serializers.ListField(
+        child=ImageUploadField(),
+        allow_empty=False,
+        max_length=DECODE_MAX_IMAGES,
+    )
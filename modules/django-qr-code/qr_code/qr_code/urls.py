@@ -2,10 +2,12 @@
 from django.urls import path, include
 from rest_framework import routers
 
-from .viewsets import QRCodeView
+from .viewsets import QRCodeView, QRCodeBatchView, QRCodeDecodeView
 
 router = routers.DefaultRouter()
 urlpatterns = [
     path('', include(router.urls)),
     path('qrcode/', QRCodeView.as_view()),
+    path('qrcode/batch/', QRCodeBatchView.as_view()),
+    path('qrcode/decode/', QRCodeDecodeView.as_view()),
 ]
\ No newline at end of file
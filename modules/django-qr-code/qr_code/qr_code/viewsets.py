@@ -1,31 +1,116 @@
+from django.http import HttpResponseNotModified, StreamingHttpResponse
+from django.utils.cache import patch_vary_headers
+from django.utils.http import parse_etags
 from rest_framework.views import APIView
+from rest_framework.parsers import MultiPartParser
+from rest_framework.renderers import JSONRenderer
 from rest_framework.response import Response
 from rest_framework import status
-import io
-import qrcode
+from rest_framework.settings import api_settings
 import base64
 
+from modules.utils import get_options
+
+from .caching import cache_key, get_or_render
+from .exports import ndjson_lines, zip_pngs
+from .pool import decode_all, render_all
+from .renderers import PNGRenderer, SVGRenderer
+from .rendering import RENDERERS
+from .serializers import QRCodeBatchSerializer, QRCodeDecodeSerializer, QRCodeSerializer
+
+DECODE_MAX_DIMENSION = get_options("qr_code", "DECODE_MAX_DIMENSION")
+DECODE_MAX_IMAGE_PIXELS = get_options("qr_code", "DECODE_MAX_IMAGE_PIXELS")
+
 
 class QRCodeView(APIView):
+    renderer_classes = list(api_settings.DEFAULT_RENDERER_CLASSES) + [PNGRenderer, SVGRenderer]
+
+    def get(self, request, *args, **kwargs):
+        """
+        Same as POST with the parameters in the query string, for clients and
+        proxies caching by URL.
+        """
+        return self.qrcode(request, request.query_params)
 
     def post(self, request, *args, **kwargs):
         """
         This function takes text as input and returns Qrcode Image converted into base64 string.
-        :param request: The Param contains an object 'data' inside it. This object contains text needs to be converted into qrcode. 
+        :param request: The Param contains an object 'data' inside it. This object contains text needs to be converted into qrcode,
+            and optionally `version`, `box_size`, `border` and `error_correction`.
+            Accepting image/png or image/svg+xml, or passing `?format=png` or `?format=svg`, returns the image itself.
+        """
+        return self.qrcode(request, request.data)
+
+    def qrcode(self, request, data):
+        serializer = QRCodeSerializer(data=data)
+        serializer.is_valid(raise_exception=True)
+        text = serializer.validated_data["text"]
+        params = serializer.get_params()
+        output = request.accepted_renderer.format
+        kind = output if output in RENDERERS else "png"
+        key = cache_key(kind, text, params)
+        etag = '"{0}.{1}"'.format(key, output)
+        # The ETag only depends on the request, so it is checked before
+        # rendering anything, whatever the method.
+        if_none_match = parse_etags(request.META.get("HTTP_IF_NONE_MATCH", ""))
+        if etag in if_none_match or "*" in if_none_match:
+            response = HttpResponseNotModified()
+        else:
+            image = get_or_render(key, lambda: RENDERERS[kind](text, **params))
+            if output in RENDERERS:
+                response = Response(image, status=status.HTTP_200_OK)
+            else:
+                img_str = base64.b64encode(image).decode("utf-8")
+                response = Response({ "qrcode": img_str }, status=status.HTTP_200_OK)
+        response["ETag"] = etag
+        patch_vary_headers(response, ["Accept"])
+        return response
+
+    def handle_exception(self, exc):
+        # Errors are reported as JSON, whatever image type was asked for.
+        if getattr(self.request, "accepted_renderer", None) and self.request.accepted_renderer.format in RENDERERS:
+            self.request.accepted_renderer = JSONRenderer()
+            self.request.accepted_media_type = JSONRenderer.media_type
+        return super().handle_exception(exc)
+
+class QRCodeBatchView(APIView):
+
+    def post(self, request, *args, **kwargs):
         """
-        qr = qrcode.QRCode(
-            version=1,
-            error_correction=qrcode.constants.ERROR_CORRECT_H,
-            box_size=4,
-            border=4,
-        )
+        Renders the QR codes of many texts at once, across a process pool.
+        :param request: Contains `texts`, the list of texts, and `output`, either
+            'ndjson' for one {index, text, qrcode} JSON line per text, or 'zip'
+            for an archive of PNGs named after the index of their text. Takes the
+            same `version`, `box_size`, `border` and `error_correction` as QRCodeView.
+        """
+        serializer = QRCodeBatchSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        texts = serializer.validated_data["texts"]
+        renderings = render_all(texts, serializer.get_params())
+        if serializer.validated_data["output"] == "zip":
+            response = StreamingHttpResponse(zip_pngs(renderings, len(texts)), content_type="application/zip")
+            response["Content-Disposition"] = 'attachment; filename="qrcodes.zip"'
+            return response
+        return StreamingHttpResponse(ndjson_lines(renderings), content_type="application/x-ndjson")
 
-        qr.add_data(request.data['text'])
-        qr.make(fit=True)
-        img = qr.make_image()
 
-        buffered = io.BytesIO()
-        img.save(buffered, format="PNG")
-        img_str = base64.b64encode(buffered.getvalue()).decode("utf-8")
-        return Response({ "qrcode": img_str }, status=status.HTTP_200_OK)
+class QRCodeDecodeView(APIView):
+    parser_classes = (MultiPartParser,)
 
+    def post(self, request, *args, **kwargs):
+        """
+        Reads the QR codes of uploaded images, decoded across a process pool.
+        :param request: A multipart form with one or more files named `images`.
+        :return: One result per image, in order, with the `name` of the file and
+            the payloads of the `codes` found in it, or an `error`.
+        """
+        serializer = QRCodeDecodeSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        files = serializer.validated_data["images"]
+        # Files are read one at a time, as the pool takes them.
+        images = (file.read() for file in files)
+        results = [
+            dict(name=files[index].name, **result)
+            for index, data, result in decode_all(images, DECODE_MAX_DIMENSION, DECODE_MAX_IMAGE_PIXELS)
+        ]
+        return Response({"results": results}, status=status.HTTP_200_OK)
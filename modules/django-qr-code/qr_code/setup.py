@@ -13,6 +13,6 @@ setup(
     name="cb_qr_code",
     version="0.1",
     packages=["qr_code"],
-    install_requires=["qrcode"],
+    install_requires=["qrcode", "Pillow", "numpy", "opencv-python-headless"],
     cmdclass={"build": BuildCommand},
 ) 
\ No newline at end of file
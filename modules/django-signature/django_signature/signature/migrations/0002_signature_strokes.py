@@ -0,0 +1,24 @@
+# Generated by Django 2.2.28 on 2026-10-18 19:45
+
+from django.db import migrations, models
+import modules.django_signature.signature.models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('signature', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='signature',
+            name='strokes',
+            field=models.BinaryField(blank=True, editable=False, null=True),
+        ),
+        migrations.AlterField(
+            model_name='signature',
+            name='image',
+            field=models.ImageField(blank=True, upload_to=modules.django_signature.signature.models.nameFile),
+        ),
+    ]
@@ -1,19 +1,21 @@
 from django.db import models
 from django.conf import settings
-import time
+
+from .paths import sharded_name
 
 def nameFile(instance, filename):
     """
-    nameFile returns the name of the file to be uploaded with the folder location.
+    nameFile returns the name of the file to be uploaded with the folder location,
+    a random name sharded under static/signature/.
 
     """
-    ext = filename.split('.')[-1]
-    milliseconds = round(time.time() * 1000)
-    filename = "%s.%s" % (milliseconds, ext)
-    return '/'.join(['static', "signature", filename])
+    return sharded_name("static/signature", filename)
 
 class Signature(models.Model):
-    image = models.ImageField(upload_to=nameFile)
+    # Either an uploaded image, or the strokes the signature was drawn with,
+    # encoded by `strokes.encode()` and rendered on demand.
+    image = models.ImageField(upload_to=nameFile, blank=True)
+    strokes = models.BinaryField(null=True, blank=True, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
 
     def __str__(self):
@@ -0,0 +1,11 @@
+URL_CACHE_MARGIN = 300
+URL_CACHE_TIMEOUT = 24 * 3600
+STROKE_WIDTH = 2.5
+STROKE_COLOR = "#000000"
+MAX_RENDER_SCALE = 8
+MAX_RENDER_DIMENSION = 3000
+RENDER_CACHE_TIMEOUT = 7 * 24 * 3600
+STAMP_WORKERS = 2
+STAMP_SIGNATURE_CACHE_SIZE = 256
+STAMP_MAX_JOBS = 1000
+STAMPED_UPLOAD_PATH = "static/stamped"
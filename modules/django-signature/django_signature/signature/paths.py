@@ -0,0 +1,35 @@
+import os
+import re
+import uuid
+
+SHARDED_NAME_RE = re.compile(r"/[0-9a-f]{2}/[0-9a-f]{2}/[0-9a-f]{32}(\.\w+)?$")
+
+
+def sharded_name(directory, filename):
+    """
+    Returns a collision-free name for `filename` in `directory`, spread over
+    two levels of subdirectories so none grows past 65536 entries, i.e.
+    "static/signature/3f/a2/3fa2c4e0b6d14f0e9c1e8f2d7a6b5c4d.png".
+    """
+    name = uuid.uuid4().hex
+    extension = os.path.splitext(filename)[1].lower()
+    return "{0}/{1}/{2}/{3}{4}".format(
+        directory.rstrip("/"), name[:2], name[2:4], name, extension
+    )
+
+
+def is_sharded(name):
+    return bool(SHARDED_NAME_RE.search(name))
+
+
+def relocate(field_file):
+    """
+    Copies a file stored under a flat name to a sharded name in the storage.
+    The old file is left in place, for the caller to delete once the new name
+    is saved.
+    :return: The new name.
+    """
+    field = field_file.field
+    new_name = field.generate_filename(field_file.instance, field_file.name)
+    with field_file.storage.open(field_file.name, "rb") as source:
+        return field_file.storage.save(new_name, source)
@@ -0,0 +1,111 @@
+"""
+Stamping signatures onto PDF documents, run in worker processes. Django is
+only imported within functions, once `init_worker` has set it up.
+"""
+import functools
+import io
+
+from pypdf import PdfReader, PdfWriter, Transformation
+from reportlab.lib.utils import ImageReader
+from reportlab.pdfgen import canvas
+
+load_overlay = None
+
+
+def init_worker(cache_size):
+    """
+    Sets up Django in a spawned worker, and its cache of signatures decoded
+    into PDF overlays, kept across jobs.
+    """
+    import django
+
+    django.setup()
+    global load_overlay
+    load_overlay = functools.lru_cache(maxsize=cache_size)(build_overlay)
+
+
+def build_overlay(signature_id):
+    """
+    Draws a signature on a page of its own size, strokes as vector paths and
+    images with their transparency.
+    :return: The pypdf page.
+    """
+    from PIL import Image
+
+    from .models import Signature
+    from .rendering import STROKE_COLOR, STROKE_WIDTH
+    from .strokes import decode
+
+    signature = Signature.objects.get(pk=signature_id)
+    buffered = io.BytesIO()
+    if signature.strokes is not None:
+        width, height, strokes = decode(signature.strokes)
+        pdf = canvas.Canvas(buffered, pagesize=(width, height))
+        pdf.setStrokeColor(STROKE_COLOR)
+        pdf.setLineWidth(STROKE_WIDTH)
+        pdf.setLineCap(1)
+        pdf.setLineJoin(1)
+        path = pdf.beginPath()
+        for stroke in strokes:
+            # PDF coordinates go up from the bottom of the page.
+            path.moveTo(stroke[0][0], height - stroke[0][1])
+            for x, y in stroke if len(stroke) > 1 else stroke * 2:
+                path.lineTo(x, height - y)
+        pdf.drawPath(path, stroke=1, fill=0)
+    else:
+        with signature.image.open("rb") as image_file:
+            image = Image.open(image_file)
+            image.load()
+        image = image.convert("RGBA")
+        width, height = image.size
+        pdf = canvas.Canvas(buffered, pagesize=(width, height))
+        pdf.drawImage(ImageReader(image), 0, 0, width, height, mask="auto")
+    pdf.showPage()
+    pdf.save()
+    return PdfReader(buffered).pages[0]
+
+
+def stamp(job):
+    """
+    Stamps a signature onto a page of a document of the storage, and saves
+    the result next to the other stamped documents.
+    :param job: A dict with the `signature` id, the `document` name, and the
+        `page` (negative to count from the end), `x`, `y` (from the bottom
+        left corner) and `width` of the signature, in points.
+    :return: A dict with the `index` of the job and its `status`, plus the
+        `output` name and `url`, or the `error`.
+    """
+    from django.core.files.base import ContentFile
+    from django.core.files.storage import default_storage
+    from django.db import close_old_connections
+
+    from .paths import sharded_name
+    from .stamping import STAMPED_UPLOAD_PATH
+
+    close_old_connections()
+    try:
+        overlay = load_overlay(job["signature"])
+        with default_storage.open(job["document"], "rb") as source:
+            writer = PdfWriter(clone_from=PdfReader(source))
+        page_number = job["page"] - 1 if job["page"] > 0 else job["page"]
+        if not -len(writer.pages) <= page_number < len(writer.pages):
+            raise ValueError("The document has no page {0}.".format(job["page"]))
+        page = writer.pages[page_number]
+        scale = job["width"] / float(overlay.mediabox.width)
+        page.merge_transformed_page(
+            overlay, Transformation().scale(scale).translate(job["x"], job["y"])
+        )
+        buffered = io.BytesIO()
+        writer.write(buffered)
+        output = default_storage.save(
+            sharded_name(STAMPED_UPLOAD_PATH, job["document"]),
+            ContentFile(buffered.getvalue()),
+        )
+    except Exception as e:
+        return {"index": job["index"], "status": "error", "error": str(e) or repr(e)}
+    return {
+        "index": job["index"],
+        "status": "ok",
+        "output": output,
+        "url": default_storage.url(output),
+    }
@@ -0,0 +1,85 @@
+import io
+
+from django.core.cache import cache
+from PIL import Image, ImageDraw
+
+from modules.utils import get_options
+
+from .strokes import decode
+
+STROKE_WIDTH = get_options("django_signature", "STROKE_WIDTH")
+STROKE_COLOR = get_options("django_signature", "STROKE_COLOR")
+MAX_RENDER_SCALE = get_options("django_signature", "MAX_RENDER_SCALE")
+MAX_RENDER_DIMENSION = get_options("django_signature", "MAX_RENDER_DIMENSION")
+RENDER_CACHE_TIMEOUT = get_options("django_signature", "RENDER_CACHE_TIMEOUT")
+
+CONTENT_TYPES = {"svg": "image/svg+xml", "png": "image/png"}
+# Pillow doesn't antialias lines, so they are drawn larger and scaled down.
+SUPERSAMPLING = 3
+
+
+def render_svg(data):
+    width, height, strokes = decode(data)
+    paths = []
+    for stroke in strokes:
+        if len(stroke) == 1:
+            # A dot, drawn as a zero length line with round caps.
+            stroke = stroke * 2
+        paths.append(
+            "M" + " L".join("{0:g} {1:g}".format(x, y) for x, y in stroke)
+        )
+    return (
+        '<svg xmlns="http://www.w3.org/2000/svg" width="{0}" height="{1}" '
+        'viewBox="0 0 {0} {1}"><path d="{2}" fill="none" stroke="{3}" '
+        'stroke-width="{4:g}" stroke-linecap="round" stroke-linejoin="round"/></svg>'
+    ).format(width, height, " ".join(paths), STROKE_COLOR, STROKE_WIDTH)
+
+
+def render_png(data, scale=1):
+    """
+    Rasterizes the strokes on a transparent background, `scale` times the
+    size they were drawn at. The scale is lowered so that neither side
+    exceeds MAX_RENDER_DIMENSION, and so is supersampling, which then only
+    applies while the canvas drawn on stays within that size.
+    """
+    width, height, strokes = decode(data)
+    scale = min(scale, MAX_RENDER_DIMENSION / max(width, height))
+    size = max(1, round(width * scale)), max(1, round(height * scale))
+    supersampling = max(1, min(SUPERSAMPLING, MAX_RENDER_DIMENSION // max(size)))
+    scale *= supersampling
+    image = Image.new("RGBA", (size[0] * supersampling, size[1] * supersampling))
+    draw = ImageDraw.Draw(image)
+    line_width = max(1, round(STROKE_WIDTH * scale))
+    radius = line_width / 2
+    for stroke in strokes:
+        points = [(x * scale, y * scale) for x, y in stroke]
+        if len(points) > 1:
+            draw.line(points, fill=STROKE_COLOR, width=line_width, joint="curve")
+        for x, y in (points[0], points[-1]):
+            draw.ellipse(
+                (x - radius, y - radius, x + radius, y + radius), fill=STROKE_COLOR
+            )
+    if supersampling > 1:
+        image = image.resize(size, Image.LANCZOS)
+    buffered = io.BytesIO()
+    image.save(buffered, format="PNG", optimize=True)
+    return buffered.getvalue()
+
+
+def render(signature, kind, scale=1):
+    """
+    Returns a signature drawn as strokes rendered as "svg" or "png", from the
+    cache when it was rendered already. Signatures never change, so renderings
+    are cached for as long as the cache keeps them.
+    """
+    if kind == "svg":
+        scale = 1
+    key = "signature:render:{0}:{1}:{2:g}".format(signature.pk, kind, scale)
+    rendering = cache.get(key)
+    if rendering is None:
+        if kind == "svg":
+            rendering = render_svg(signature.strokes)
+        else:
+            rendering = render_png(signature.strokes, scale)
+        cache.set(key, rendering, RENDER_CACHE_TIMEOUT)
+    return rendering
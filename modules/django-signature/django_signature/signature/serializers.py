@@ -1,18 +1,44 @@
+from django.urls import reverse
+
+from modules.utils import get_options
+
+from .file_urls import URLResolvingListSerializer, URLResolvingMixin
 from .models import Signature
+from .strokes import InvalidStrokes, encode
 from rest_framework import serializers
 
+STAMP_MAX_JOBS = get_options("django_signature", "STAMP_MAX_JOBS")
+
 
-class SignatureSerializer(serializers.HyperlinkedModelSerializer):
+class SignatureSerializer(URLResolvingMixin, serializers.HyperlinkedModelSerializer):
     image = serializers.SerializerMethodField()
+    svg = serializers.SerializerMethodField()
+
+    url_fields = ("image",)
 
     def get_image(self, obj):
-        return obj.image.url
+        # Signatures drawn as strokes link to their PNG rendering.
+        if obj.strokes is not None:
+            return self.rendering_url(obj, "signature-png")
+        return self.file_url(obj.image)
+
+    def get_svg(self, obj):
+        if obj.strokes is not None:
+            return self.rendering_url(obj, "signature-svg")
+        return None
+
+    def rendering_url(self, obj, url_name):
+        url = reverse(url_name, args=[obj.pk])
+        request = self.context.get("request")
+        return request.build_absolute_uri(url) if request else url
 
     class Meta:
         model = Signature
+        list_serializer_class = URLResolvingListSerializer
         fields = (
             "id",
             "image",
+            "svg",
         )
 
 
@@ -22,3 +48,76 @@ class SignatureUploadSerializer(serializers.ModelSerializer):
     class Meta:
         model = Signature
         fields = ("image",)
+
+
+class StrokesField(serializers.Field):
+    """
+    Strokes as lists of flat coordinates in pixels, i.e.
+    [[x0, y0, x1, y1, ...], [x0, y0, ...]].
+    """
+
+    def to_internal_value(self, data):
+        return data
+
+    def to_representation(self, value):
+        return value
+
+
+class SignatureStrokesSerializer(serializers.Serializer):
+    width = serializers.IntegerField(min_value=1, max_value=2000)
+    height = serializers.IntegerField(min_value=1, max_value=2000)
+    strokes = StrokesField()
+
+    def validate(self, attrs):
+        try:
+            attrs["strokes"] = encode(attrs["strokes"], attrs["width"], attrs["height"])
+        except InvalidStrokes as e:
+            raise serializers.ValidationError({"strokes": str(e)})
+        return attrs
+
+    def create(self, validated_data):
+        return Signature.objects.create(strokes=validated_data["strokes"])
+
+
+class StampPositionSerializer(serializers.Serializer):
+    """
+    Where a signature goes on a document, in points from the bottom left
+    corner of the page. Its height follows from its width.
+    """
+    page = serializers.IntegerField(default=1)
+    x = serializers.FloatField(min_value=0)
+    y = serializers.FloatField(min_value=0)
+    width = serializers.FloatField(min_value=1)
+
+    def validate_page(self, value):
+        if value == 0:
+            raise serializers.ValidationError("Pages are numbered from 1, or from -1 for the last one.")
+        return value
+
+
+class StampJobSerializer(serializers.Serializer):
+    signature = serializers.IntegerField(min_value=1)
+    document = serializers.CharField(max_length=255)
+    position = StampPositionSerializer()
+
+
+class StampBatchSerializer(serializers.Serializer):
+    jobs = StampJobSerializer(many=True, allow_empty=False, max_length=STAMP_MAX_JOBS)
+
+    def validate_jobs(self, value):
+        ids = {job["signature"] for job in value}
+        missing = ids - set(Signature.objects.filter(pk__in=ids).values_list("pk", flat=True))
+        if missing:
+            raise serializers.ValidationError(
+                "Unknown signatures: {0}.".format(", ".join(map(str, sorted(missing))))
+            )
+        return value
+
+    def get_jobs(self):
+        """
+        :return: The jobs as handed to the stamping workers.
+        """
+        return [
+            dict(index=index, signature=job["signature"], document=job["document"], **job["position"])
+            for index, job in enumerate(self.validated_data["jobs"])
+        ]
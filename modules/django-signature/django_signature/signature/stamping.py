@@ -0,0 +1,69 @@
+import multiprocessing
+import threading
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+
+from modules.utils import get_options
+
+from . import pdf
+
+STAMP_WORKERS = get_options("django_signature", "STAMP_WORKERS")
+STAMP_SIGNATURE_CACHE_SIZE = get_options("django_signature", "STAMP_SIGNATURE_CACHE_SIZE")
+STAMPED_UPLOAD_PATH = get_options("django_signature", "STAMPED_UPLOAD_PATH")
+
+# Jobs queued per worker, enough to keep them busy without holding a whole
+# batch of pending results in memory.
+JOBS_PER_WORKER = 2
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    """
+    Returns the process pool stamping documents, created on first use.
+    Workers are spawned, so they set up Django on their own.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=STAMP_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=pdf.init_worker,
+                initargs=(STAMP_SIGNATURE_CACHE_SIZE,),
+            )
+    return _pool
+
+
+def discard_pool():
+    global _pool
+    with _pool_lock:
+        _pool = None
+
+
+def run(jobs):
+    """
+    Stamps the documents of `jobs` and yields each result as soon as it is
+    ready, in completion order. Each worker has at most JOBS_PER_WORKER jobs
+    queued, so memory stays bounded however large the batch is.
+    """
+    pool = get_pool()
+    pending = set()
+    try:
+        for job in jobs:
+            if len(pending) >= STAMP_WORKERS * JOBS_PER_WORKER:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                yield from (future.result() for future in done)
+            pending.add(pool.submit(pdf.stamp, job))
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            yield from (future.result() for future in done)
+    except BrokenProcessPool:
+        # A worker died, i.e. killed for using too much memory.
+        discard_pool()
+        raise
+    finally:
+        # The client went away, don't stamp the rest.
+        for future in pending:
+            future.cancel()
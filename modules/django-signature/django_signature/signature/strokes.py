@@ -0,0 +1,123 @@
+"""
+Compact binary encoding of signatures drawn as strokes.
+
+Points are stored in fixed point at 1/PRECISION pixel, each as the difference
+from the previous point, zigzag-mapped so small negative steps stay small,
+and written as variable length integers. Consecutive pen positions are a few
+pixels apart, so most coordinates take a single byte.
+
+Layout: version, precision, width, height, number of strokes, then for each
+stroke its number of points followed by the x and y deltas of its points.
+"""
+import math
+
+VERSION = 1
+PRECISION = 10
+MAX_STROKES = 1000
+MAX_POINTS = 50000
+MAX_COORDINATE = 100000
+
+
+class InvalidStrokes(Exception):
+    pass
+
+
+def write_varint(buffer, value):
+    while value > 0x7F:
+        buffer.append((value & 0x7F) | 0x80)
+        value >>= 7
+    buffer.append(value)
+
+
+def read_varint(data, position):
+    value = shift = 0
+    while True:
+        byte = data[position]
+        position += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, position
+        shift += 7
+
+
+def zigzag(value):
+    return value * 2 if value >= 0 else -value * 2 - 1
+
+
+def unzigzag(value):
+    return value >> 1 if not value & 1 else -((value + 1) >> 1)
+
+
+def validate(strokes):
+    """
+    Checks strokes given as lists of flat coordinates, [x0, y0, x1, y1, ...].
+    :raises InvalidStrokes:
+    """
+    if not isinstance(strokes, list) or not strokes:
+        raise InvalidStrokes("Strokes must be a non-empty list.")
+    if len(strokes) > MAX_STROKES:
+        raise InvalidStrokes("At most {0} strokes are allowed.".format(MAX_STROKES))
+    points = 0
+    for stroke in strokes:
+        if not isinstance(stroke, list) or not stroke or len(stroke) % 2:
+            raise InvalidStrokes("Each stroke must list x and y coordinates in turns.")
+        for coordinate in stroke:
+            if (
+                isinstance(coordinate, bool)
+                or not isinstance(coordinate, (int, float))
+                or not math.isfinite(coordinate)
+                or abs(coordinate) > MAX_COORDINATE
+            ):
+                raise InvalidStrokes("Coordinates must be numbers.")
+        points += len(stroke) // 2
+    if points > MAX_POINTS:
+        raise InvalidStrokes("At most {0} points are allowed.".format(MAX_POINTS))
+
+
+def encode(strokes, width, height):
+    """
+    :param strokes: Lists of flat coordinates, in pixels.
+    :return: The encoded bytes.
+    """
+    validate(strokes)
+    buffer = bytearray([VERSION])
+    for value in (PRECISION, width, height, len(strokes)):
+        write_varint(buffer, value)
+    previous = 0, 0
+    for stroke in strokes:
+        write_varint(buffer, len(stroke) // 2)
+        for i in range(0, len(stroke), 2):
+            x = round(stroke[i] * PRECISION)
+            y = round(stroke[i + 1] * PRECISION)
+            write_varint(buffer, zigzag(x - previous[0]))
+            write_varint(buffer, zigzag(y - previous[1]))
+            previous = x, y
+    return bytes(buffer)
+
+
+def decode(data):
+    """
+    :return: The width, height and strokes, each a list of (x, y) points.
+    """
+    data = bytes(data)
+    if not data or data[0] != VERSION:
+        raise InvalidStrokes("Unknown strokes encoding.")
+    position = 1
+    header = []
+    for _ in range(4):
+        value, position = read_varint(data, position)
+        header.append(value)
+    precision, width, height, count = header
+    strokes = []
+    x = y = 0
+    for _ in range(count):
+        points, position = read_varint(data, position)
+        stroke = []
+        for _ in range(points):
+            dx, position = read_varint(data, position)
+            dy, position = read_varint(data, position)
+            x += unzigzag(dx)
+            y += unzigzag(dy)
+            stroke.append((x / precision, y / precision))
+        strokes.append(stroke)
+    return width, height, strokes
@@ -2,7 +2,7 @@
 from django.urls import path, include
 from rest_framework import routers
 
-from .viewsets import SignatureViewSet, SignatureUploadView
+from .viewsets import SignatureViewSet, SignatureUploadView, SignatureStampView
 
 
 router = routers.DefaultRouter()
@@ -11,4 +11,5 @@ router.register(r'signature', SignatureViewSet)
 urlpatterns = [
     path('', include(router.urls)),
     path('upload_signature/', SignatureUploadView.as_view()),
+    path('stamp_signatures/', SignatureStampView.as_view()),
 ]
@@ -1,18 +1,69 @@
+from . import stamping
 from .models import Signature
-from .serializers import SignatureSerializer, SignatureUploadSerializer
+from .rendering import CONTENT_TYPES, MAX_RENDER_SCALE, render
+from .serializers import SignatureSerializer, StampBatchSerializer, SignatureStrokesSerializer, SignatureUploadSerializer
 from rest_framework import viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.negotiation import BaseContentNegotiation
 from rest_framework.parsers import FileUploadParser
 from rest_framework.views import APIView
 from rest_framework import permissions, status
 from rest_framework.response import Response
 import base64
+import json
 from django.core.files.base import ContentFile
+from django.http import HttpResponse, StreamingHttpResponse
+from django.utils.cache import patch_cache_control
+
+
+class IgnoreClientContentNegotiation(BaseContentNegotiation):
+    """
+    Renderings answer with their own content type, whatever the client accepts.
+    """
+
+    def select_parser(self, request, parsers):
+        return parsers[0]
+
+    def select_renderer(self, request, renderers, format_suffix=None):
+        return (renderers[0], renderers[0].media_type)
+
 
 class SignatureViewSet(viewsets.ModelViewSet):
     queryset = Signature.objects.all()
     serializer_class = SignatureSerializer
     http_method_names = ["get"]
 
+    @action(detail=True, methods=["get"], content_negotiation_class=IgnoreClientContentNegotiation)
+    def svg(self, request, *args, **kwargs):
+        """
+        Returns a signature drawn as strokes as an SVG image.
+        """
+        return self.rendering(request, "svg")
+
+    @action(detail=True, methods=["get"], content_negotiation_class=IgnoreClientContentNegotiation)
+    def png(self, request, *args, **kwargs):
+        """
+        Returns a signature drawn as strokes as a PNG image with a transparent
+        background, `scale` (1 to 8) times the size it was drawn at.
+        """
+        return self.rendering(request, "png")
+
+    def rendering(self, request, kind):
+        signature = self.get_object()
+        if signature.strokes is None:
+            raise NotFound("This signature was uploaded as an image.")
+        try:
+            scale = float(request.query_params.get("scale", 1))
+        except ValueError:
+            scale = 0
+        if not 0 < scale <= MAX_RENDER_SCALE:
+            raise ValidationError({"scale": "Must be between 0 and {0}.".format(MAX_RENDER_SCALE)})
+        response = HttpResponse(render(signature, kind, scale), content_type=CONTENT_TYPES[kind])
+        # Signatures never change once uploaded.
+        patch_cache_control(response, public=True, max_age=365 * 24 * 3600, immutable=True)
+        return response
+
 
 class SignatureUploadView(APIView):
 	parser_class = (FileUploadParser,)
@@ -22,12 +73,46 @@ class SignatureUploadView(APIView):
 		Upload image to the location created in the models.py by fileName method.
 		:param request: Contains object named data which has image 64base converted image to be uploaded. 
 		"""
+		if 'strokes' in request.data:
+			return self.post_strokes(request)
 		try:
 			image = request.data['image']
 			format, imgstr = image.split(';base64,')
 			ext = format.split('/')[-1]
 			data = ContentFile(base64.b64decode(imgstr), name='temp.' + ext)
-			Signature.objects.create(image=data)
-			return Response({"message": "Image uploaded successfully."}, status=status.HTTP_201_CREATED)
+			signature = Signature.objects.create(image=data)
+			return Response({"message": "Image uploaded successfully.", "id": signature.pk}, status=status.HTTP_201_CREATED)
 		except Exception as e:
 			return Response(e.args[0], status=status.HTTP_400_BAD_REQUEST)
+
+	def post_strokes(self, request):
+		"""
+		Stores a signature from the strokes it was drawn with, given as `width`
+		and `height` of the drawing area and `strokes`, a list of flat
+		coordinates [x0, y0, x1, y1, ...] per stroke.
+		"""
+		serializer = SignatureStrokesSerializer(data=request.data)
+		serializer.is_valid(raise_exception=True)
+		signature = serializer.save()
+		return Response({"message": "Signature uploaded successfully.", "id": signature.pk}, status=status.HTTP_201_CREATED)
+
+
+class SignatureStampView(APIView):
+	permission_classes = (permissions.IsAdminUser,)
+	content_negotiation_class = IgnoreClientContentNegotiation
+
+	def post(self, request, *args, **kwargs):
+		"""
+		Stamps signatures onto PDF documents of the storage.
+		:param request: Contains `jobs`, a list of
+			{signature: id, document: 'storage name', position: {page, x, y, width}}.
+		:return: One JSON line per job as it completes, with the `index` of the
+			job, its `status` and the `output` name and `url`, or the `error`.
+		"""
+		serializer = StampBatchSerializer(data=request.data)
+		serializer.is_valid(raise_exception=True)
+		results = stamping.run(serializer.get_jobs())
+		return StreamingHttpResponse(
+			(json.dumps(result) + "\n" for result in results),
+			content_type="application/x-ndjson",
+		)
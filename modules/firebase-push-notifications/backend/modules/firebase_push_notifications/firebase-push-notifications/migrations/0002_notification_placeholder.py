@@ -0,0 +1,18 @@
+# Generated by Django 2.2.28 on 2026-10-18 18:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('firebase-push-notifications', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='notification',
+            name='placeholder',
+            field=models.TextField(blank=True, editable=False),
+        ),
+    ]
@@ -3,6 +3,9 @@ from django.db import models
 
 from django.db.models.signals import post_save
 from django.dispatch import receiver
+
+from .placeholders import placeholder_for
+
 User = get_user_model()
 
 
@@ -12,11 +15,20 @@ class Notification(models.Model):
     title = models.CharField(max_length=200)
     message = models.TextField()
     image = models.FileField(upload_to="notification", null=True, blank=True)
+    # Blurred 16px preview of `image` as a data URI, empty if it isn't an image.
+    placeholder = models.TextField(blank=True, editable=False)
     created = models.DateTimeField(auto_now_add=True)
 
     def __str__(self):
         return str(self.sender)
 
+    def save(self, *args, **kwargs):
+        if self.image and not self.image._committed:
+            self.placeholder = placeholder_for(self.image)
+        elif not self.image:
+            self.placeholder = ""
+        super().save(*args, **kwargs)
+
 
 class UserNotification(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="user_notification")
@@ -12,6 +12,6 @@ class BuildCommand(build):
 setup(name='cb_firebase_push_notifications',
       version='0.1',
       packages=[],
-      install_requires=["fcm_django == 0.3.4"],
+      install_requires=["fcm_django == 0.3.4", "Pillow", "numpy"],
       cmdclass={"build": BuildCommand}
       )